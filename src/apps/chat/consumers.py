@@ -1,19 +1,41 @@
 # consumers.py
-from typing import Dict
+import asyncio
+from typing import Dict, Optional
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
-from .models import Message
+from .models import Chat, Message
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Q
 from asgiref.sync import sync_to_async
 
-User = get_user_model()
+from src.apps.chat.services import chat_service, message_service
+from src.apps.chat.writer import message_writer
+from src.utils.conts import CHAT_HISTORY_MAX_PAGE_SIZE, CHAT_HISTORY_PAGE_SIZE
 
 
-def chat_group_name(user1_id: int, user2_id: int) -> str:
-    a, b = sorted([int(user1_id), int(user2_id)])
-    return f"chat_{a}_{b}"
+def user_group_name(user_id: int) -> str:
+    """Personal group: every open connection (device) of the user joins it."""
+    return f"user-{user_id}"
+
+
+def message_payload(message: Message, chat: Chat) -> Dict:
+    recipient_id = (
+        chat.user2_id if message.sender_id == chat.user1_id else chat.user1_id
+    )
+    return {
+        "id": message.id,
+        "chat": chat.id,
+        "from": message.sender_id,
+        "to": recipient_id,
+        "text": message.text,
+        "created_at": message.created_at.isoformat(),
+    }
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 class ChatConsumer(AsyncJsonWebsocketConsumer):
@@ -25,8 +47,9 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
         self.user = user
         self.groups = set()
+        self.chats: Dict[int, Chat] = {}
 
-        personal = f"user-{self.user.id}"
+        personal = user_group_name(self.user.id)
         await self.channel_layer.group_add(personal, self.channel_name)
         self.groups.add(personal)
 
@@ -35,65 +58,74 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     async def receive_json(self, content, **kwargs):
         """
         Ожидаемые команды от клиента:
-        - {"command": "join", "other_id": 42}
-        - {"command": "leave", "other_id": 42}
+        - {"command": "join", "other_id": 42}  (возвращает последнюю страницу истории)
+        - {"command": "leave", "other_id": 42}  (ничего не делает, для старых клиентов)
         - {"command": "message", "to": 42, "text": "hi"}
-        - {"command": "history", "other_id": 42, "limit": 50}
+        - {"command": "history", "other_id": 42, "limit": 50, "before_id": 1000}
+          (before_id — id самого старого уже загруженного сообщения)
+        - {"command": "read", "other_id": 42}  (сбрасывает счётчик непрочитанных)
         """
         cmd = content.get("command")
         if cmd == "join":
-            other_id = content.get("other_id")
-            if not other_id:
+            other_id = _int_or_none(content.get("other_id"))
+            if other_id is None:
                 await self.send_json({"error": "other_id required for join"})
                 return
-            group = chat_group_name(self.user.id, other_id)
-            await self.add_group(group)
-            msgs = await self.get_last_messages(self.user.id, other_id, limit=50)
-            await self.send_json({"command": "history", "messages": msgs})
+            await self.send_json(await self.get_history(other_id))
             return
 
         if cmd == "leave":
-            other_id = content.get("other_id")
-            if not other_id:
-                return
-            group = chat_group_name(self.user.id, other_id)
-            await self.remove_group(group)
+            # messages arrive through the personal groups, nothing to leave
             return
 
         if cmd == "history":
-            other_id = content.get("other_id")
-            limit = int(content.get("limit", 50))
-            msgs = await self.get_last_messages(self.user.id, other_id, limit=limit)
-            await self.send_json({"command": "history", "messages": msgs})
+            other_id = _int_or_none(content.get("other_id"))
+            if other_id is None:
+                await self.send_json({"error": "other_id required for history"})
+                return
+            page = await self.get_history(
+                other_id,
+                before_id=_int_or_none(content.get("before_id")),
+                limit=_int_or_none(content.get("limit")) or CHAT_HISTORY_PAGE_SIZE,
+            )
+            await self.send_json(page)
+            return
+
+        if cmd == "read":
+            other_id = _int_or_none(content.get("other_id"))
+            if other_id is None:
+                await self.send_json({"error": "other_id required for read"})
+                return
+            await self.mark_read(other_id)
             return
 
         if cmd == "message":
-            to_id = content.get("to")
+            to_id = _int_or_none(content.get("to"))
             text = content.get("text", "").strip()
             if not to_id or not text:
                 await self.send_json({"error": "to and text required"})
                 return
 
-            recipient = await self.get_user_or_none(to_id)
-            if not recipient:
+            # the chat is cached per connection: no DB round trip after the first
+            chat = self.chats.get(to_id) or await self.open_chat(to_id)
+            if not chat:
                 await self.send_json({"error": "recipient not found"})
                 return
-            message = await self.create_message(self.user.id, recipient.id, text)
-            payload = {
-                "id": message.id,
-                "from": self.user.id,
-                "to": recipient.id,
-                "text": message.text,
-                "created_at": message.created_at.isoformat(),
-            }
-            group = chat_group_name(self.user.id, recipient.id)
-            await self.add_group(group)
-            await self.channel_layer.group_send(
-                group,
-                {
-                    "type": "chat.message",
-                    "message": payload,
-                },
+            message = Message(
+                id=await message_writer.next_id(),
+                chat_id=chat.id,
+                sender_id=self.user.id,
+                text=text,
+                created_at=timezone.now(),
+            )
+            await message_writer.submit(message)
+            event = {"type": "chat.message", "message": message_payload(message, chat)}
+            # recipient's devices, and the sender's other devices (and this one)
+            await asyncio.gather(
+                *(
+                    self.channel_layer.group_send(user_group_name(user_id), event)
+                    for user_id in (to_id, self.user.id)
+                )
             )
             return
 
@@ -103,16 +135,6 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         """Тип события group_send -> отправляем на WS"""
         await self.send_json({"command": "message", "message": event["message"]})
 
-    async def add_group(self, group_name: str):
-        if group_name not in self.groups:
-            await self.channel_layer.group_add(group_name, self.channel_name)
-            self.groups.add(group_name)
-
-    async def remove_group(self, group_name: str):
-        if group_name in self.groups:
-            await self.channel_layer.group_discard(group_name, self.channel_name)
-            self.groups.discard(group_name)
-
     async def disconnect(self, code):
         for group in list(self.groups):
             try:
@@ -121,43 +143,48 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                 pass
 
     @database_sync_to_async
-    def get_user_or_none(self, user_id):
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
+    def mark_read(self, other_id: int) -> None:
+        chat = self.get_chat(other_id)
+        if chat is not None:
+            chat_service.mark_read(chat, self.user.id)
 
     @database_sync_to_async
-    def create_message(self, from_id, to_id, text):
-        msg = Message.objects.create(
-            sender_id=from_id,
-            recipient_id=to_id,
-            text=text,
-            created_at=timezone.now(),
-        )
-        return msg
+    def open_chat(self, other_id: int) -> Optional[Chat]:
+        chat = chat_service.get_or_create_between(self.user.id, other_id)
+        if chat is not None:
+            self.chats[other_id] = chat
+        return chat
+
+    def get_chat(self, other_id: int) -> Optional[Chat]:
+        """The chat with `other_id`, looked up once per connection."""
+        other_id = int(other_id)
+        if other_id not in self.chats:
+            chat = chat_service.between(self.user.id, other_id)
+            if chat is None:
+                return None
+            self.chats[other_id] = chat
+        return self.chats[other_id]
 
     @database_sync_to_async
-    def get_last_messages(self, user1_id, user2_id, limit=50):
-        a, b = sorted([int(user1_id), int(user2_id)])
-        qs = (
-            Message.objects.filter()
-            .filter(
-                (Q(sender_id=a) & Q(recipient_id=b))
-                | (Q(sender_id=b) & Q(recipient_id=a))
-            )
-            .order_by("-created_at")[:limit]
-        )
-        return [
-            {
-                "id": m.id,
-                "from": m.sender_id,
-                "to": m.recipient_id,
-                "text": m.text,
-                "created_at": m.created_at.isoformat(),
-            }
-            for m in reversed(qs)
-        ]
+    def get_history(
+        self,
+        other_id: int,
+        before_id: Optional[int] = None,
+        limit: int = CHAT_HISTORY_PAGE_SIZE,
+    ) -> Dict:
+        """
+        One page of messages older than `before_id`, oldest first. The
+        returned `before_id` requests the next (older) page; null at the end.
+        """
+        limit = max(1, min(limit, CHAT_HISTORY_MAX_PAGE_SIZE))
+        chat = self.get_chat(other_id)
+        messages = message_service.history(chat.id, before_id, limit) if chat else []
+        return {
+            "command": "history",
+            "chat": chat.id if chat else None,
+            "messages": [message_payload(m, chat) for m in reversed(messages)],
+            "before_id": messages[-1].id if len(messages) == limit else None,
+        }
 
 
 def concat_name(user):
@@ -170,6 +197,9 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
         self.groups = set()
         self.user = self.scope["user"]
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
         group = await sync_to_async(concat_name)(self.user)
         await self.add_group(group)
         await self.accept()
@@ -180,8 +210,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
 
     async def disconnect(self, code):
         for group in self.groups:
-            await self.channel_layer.group_discard(group, self.channel_layer)
-        await self.disconnect()
+            await self.channel_layer.group_discard(group, self.channel_name)
 
     async def send_notification(self, event: Dict):
         await self.send_json(content=event["data"])
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["chat", "created_at", "id"], name="idx_message_chat_created_id"
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="message",
+            name="chat_messag_chat_id_0c7b25_idx",
+        ),
+    ]
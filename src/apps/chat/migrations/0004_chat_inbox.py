@@ -0,0 +1,73 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_inbox(apps, schema_editor):
+    Chat = apps.get_model("chat", "Chat")
+    Message = apps.get_model("chat", "Message")
+
+    latest = Message.objects.filter(chat_id=OuterRef("pk")).order_by(
+        "-created_at", "-id"
+    )
+
+    def unread_from(sender):
+        return Coalesce(
+            Subquery(
+                Message.objects.filter(
+                    chat_id=OuterRef("pk"), sender_id=OuterRef(sender), is_read=False
+                )
+                .order_by()
+                .values("chat_id")
+                .annotate(total=Count("id"))
+                .values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    Chat.objects.filter(Exists(Message.objects.filter(chat_id=OuterRef("pk")))).update(
+        last_message_id=Subquery(latest.values("id")[:1]),
+        last_message_at=Subquery(latest.values("created_at")[:1]),
+        last_message_text=Subquery(latest.values(preview=Substr("text", 1, 120))[:1]),
+        user1_unread=unread_from("user2_id"),
+        user2_unread=unread_from("user1_id"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0003_message_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chat",
+            name="last_message_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="last_message_id",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="last_message_text",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="user1_unread",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chat",
+            name="user2_unread",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_inbox, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.utils import timezone
 
 from src.apps.accounts.models import User
 from src.utils.bases.models import AbstractTimestampsModel
+from src.utils.conts import LAST_MESSAGE_PREVIEW_LENGTH
 
 from django.contrib.auth import get_user_model
 
@@ -15,6 +17,15 @@ class Chat(AbstractTimestampsModel):
     user2 = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="chats_as_user2"
     )
+    # denormalized for the inbox, maintained when messages are stored/read;
+    # no FK: messages reach the table after they are delivered (chat.writer)
+    last_message_id = models.BigIntegerField(null=True, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_text = models.CharField(
+        max_length=LAST_MESSAGE_PREVIEW_LENGTH, blank=True, default=""
+    )
+    user1_unread = models.PositiveIntegerField(default=0)
+    user2_unread = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = (("user1", "user2"),)
@@ -33,6 +44,9 @@ class Chat(AbstractTimestampsModel):
     def other_user(self, user):
         return self.user2 if user.id == self.user1_id else self.user1
 
+    def unread_for(self, user) -> int:
+        return self.user1_unread if user.id == self.user1_id else self.user2_unread
+
     def __str__(self):
         return f"Chat({self.user1_id},{self.user2_id})"
 
@@ -43,13 +57,17 @@ class Message(models.Model):
         User, on_delete=models.CASCADE, related_name="sent_messages"
     )
     text = models.TextField()  # TextField — нормально для длинных сообщений
-    created_at = models.DateTimeField(auto_now_add=True)
+    # set by the sender before the row is written (see chat.writer)
+    created_at = models.DateTimeField(default=timezone.now)
     is_read = models.BooleanField(default=False)
 
     class Meta:
         ordering = ("created_at",)
         indexes = [
-            models.Index(fields=["chat", "created_at"]),
+            # keyset pages of chat history: (chat, created_at, id) < cursor
+            models.Index(
+                fields=["chat", "created_at", "id"], name="idx_message_chat_created_id"
+            ),
             models.Index(fields=["sender", "created_at"]),
         ]
 
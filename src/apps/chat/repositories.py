@@ -0,0 +1,154 @@
+import threading
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from django.db import connection
+from django.db.models import Case, F, Max, Q, QuerySet, Subquery, Value, When
+
+from src.apps.accounts.models import User
+from src.apps.chat.models import Chat, Message
+from src.utils.bases.repositories import AbstractRepository
+from src.utils.conts import LAST_MESSAGE_PREVIEW_LENGTH
+
+
+class ChatRepository(AbstractRepository[Chat]):
+    model = Chat
+
+    def between(self, user_id: int, other_id: int) -> Optional[Chat]:
+        user1_id, user2_id = sorted([int(user_id), int(other_id)])
+        return self.filter(user1_id=user1_id, user2_id=user2_id).first()
+
+    def get_or_create_between(self, user_id: int, other_id: int) -> Optional[Chat]:
+        """None when `other_id` is not an existing user other than `user_id`."""
+        user1_id, user2_id = sorted([int(user_id), int(other_id)])
+        if user1_id == user2_id or not User.objects.filter(id=other_id).exists():
+            return None
+        chat, _ = self.get_or_create(user1_id=user1_id, user2_id=user2_id)
+        return chat
+
+    def inbox(self, user_id: int) -> QuerySet[Chat]:
+        return self.filter(
+            Q(user1_id=user_id) | Q(user2_id=user_id), last_message_id__isnull=False
+        ).select_related("user1", "user2")
+
+    def lock(self, chat_ids: Iterable[int]) -> List[int]:
+        """Row locks in id order, so concurrent lockers cannot deadlock."""
+        return list(
+            self.filter(id__in=set(chat_ids))
+            .select_for_update()
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def record_messages(self, messages: Iterable[Message]) -> None:
+        """
+        Moves last_message_* forward and adds to the recipient's unread counter,
+        one UPDATE per chat. Batches from different processes may arrive out
+        of order, so the last message only ever moves to a newer one.
+        """
+        by_chat = defaultdict(list)
+        for message in messages:
+            by_chat[message.chat_id].append(message)
+        if not by_chat:
+            return
+
+        first_users = dict(self.filter(id__in=by_chat).values_list("id", "user1_id"))
+        for chat_id, chat_messages in by_chat.items():
+            last = max(chat_messages, key=lambda m: (m.created_at, m.id))
+            from_user1 = sum(
+                1 for m in chat_messages if m.sender_id == first_users.get(chat_id)
+            )
+            newer = (
+                Q(last_message_at__isnull=True)
+                | Q(last_message_at__lt=last.created_at)
+                | Q(last_message_at=last.created_at, last_message_id__lt=last.id)
+            )
+            self.filter(id=chat_id).update(
+                **{
+                    field: Case(
+                        When(newer, then=Value(value)),
+                        default=F(field),
+                        output_field=self.model._meta.get_field(field),
+                    )
+                    for field, value in (
+                        ("last_message_id", last.id),
+                        ("last_message_at", last.created_at),
+                        ("last_message_text", last.text[:LAST_MESSAGE_PREVIEW_LENGTH]),
+                        ("updated_at", last.created_at),
+                    )
+                },
+                user1_unread=F("user1_unread") + len(chat_messages) - from_user1,
+                user2_unread=F("user2_unread") + from_user1,
+            )
+
+    def mark_read(self, chat: Chat, user_id: int) -> int:
+        field = "user1_unread" if user_id == chat.user1_id else "user2_unread"
+        return self.filter(id=chat.id).exclude(**{field: 0}).update(**{field: 0})
+
+
+class MessageRepository(AbstractRepository[Message]):
+    model = Message
+
+    def __init__(self):
+        self._last_reserved = 0
+        self._lock = threading.Lock()
+
+    def reserve_ids(self, count: int) -> List[int]:
+        """
+        Takes `count` ids from the primary key sequence in one query, so rows
+        inserted later with these ids never collide with `create()`.
+        """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                    "FROM generate_series(1, %s)",
+                    [self.table_name, self.model._meta.pk.column, count],
+                )
+                return [row[0] for row in cursor.fetchall()]
+
+        # no sequences to share: only safe with a single writing process
+        with self._lock:
+            last = self.all().aggregate(last=Max("id"))["last"] or 0
+            first = max(last, self._last_reserved) + 1
+            self._last_reserved = first + count - 1
+            return list(range(first, first + count))
+
+    def history(
+        self, chat_id: int, before_id: Optional[int], limit: int
+    ) -> List[Message]:
+        """
+        Up to `limit` messages of the chat older than `before_id`, newest
+        first: one range scan of the (chat, created_at, id) index.
+        """
+        queryset = self.filter(chat_id=chat_id)
+        if before_id is not None:
+            before = Subquery(
+                self.filter(chat_id=chat_id, id=before_id).values("created_at")
+            )
+            # (created_at, id) < (before, before_id)
+            queryset = queryset.filter(
+                Q(created_at__lt=before) | Q(created_at=before, id__lt=before_id),
+                created_at__lte=before,
+            )
+        return list(queryset.order_by("-created_at", "-id")[:limit])
+
+    def insert_new(self, messages: List[Message]) -> List[Message]:
+        """Inserts the messages whose id is not stored yet and returns them."""
+        stored = set(
+            self.filter(id__in=[m.id for m in messages]).values_list("id", flat=True)
+        )
+        new = [m for m in messages if m.id not in stored]
+        self.bulk_create(new, ignore_conflicts=True)
+        return new
+
+    def mark_read(self, chat_id: int, reader_id: int) -> int:
+        return (
+            self.filter(chat_id=chat_id, is_read=False)
+            .exclude(sender_id=reader_id)
+            .update(is_read=True)
+        )
+
+
+chat_repo = ChatRepository()
+message_repo = MessageRepository()
@@ -12,3 +12,34 @@ class ChatSerializer(serializers.Serializer):
 
     def update(self, instance, validated_data):
         return super().update(instance, validated_data)
+
+
+class ChatUserSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    avatar = serializers.ImageField(read_only=True)
+
+
+class LastMessageSerializer(serializers.Serializer):
+    id = serializers.IntegerField(source="last_message_id")
+    text = serializers.CharField(source="last_message_text")
+    created_at = serializers.DateTimeField(source="last_message_at")
+
+
+class ChatInboxSerializer(serializers.Serializer):
+    """One inbox row, built from the denormalized fields of `Chat` only."""
+
+    id = serializers.IntegerField(read_only=True)
+    user = serializers.SerializerMethodField()
+    last_message = LastMessageSerializer(source="*", read_only=True)
+    unread = serializers.SerializerMethodField()
+    updated_at = serializers.DateTimeField(read_only=True)
+
+    def _me(self):
+        return self.context["request"].user
+
+    def get_user(self, obj) -> dict:
+        return ChatUserSerializer(obj.other_user(self._me())).data
+
+    def get_unread(self, obj) -> int:
+        return obj.unread_for(self._me())
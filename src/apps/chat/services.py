@@ -0,0 +1,75 @@
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from src.apps.chat.models import Chat, Message
+from src.apps.chat.repositories import (
+    ChatRepository,
+    MessageRepository,
+    chat_repo,
+    message_repo,
+)
+from src.utils.bases.services import AbstractService
+from src.utils.conts import CHAT_HISTORY_MAX_PAGE_SIZE
+
+
+class ChatService(AbstractService[Chat]):
+    def __init__(self, repository: ChatRepository = chat_repo):
+        super().__init__(repository)
+
+    def between(self, user_id: int, other_id: int) -> Optional[Chat]:
+        return self._repository.between(user_id, other_id)
+
+    def get_or_create_between(self, user_id: int, other_id: int) -> Optional[Chat]:
+        return self._repository.get_or_create_between(user_id, other_id)
+
+    def inbox(self, user_id: int) -> QuerySet[Chat]:
+        return self._repository.inbox(user_id)
+
+    def lock(self, chat_ids: Iterable[int]) -> List[int]:
+        return self._repository.lock(chat_ids)
+
+    def record_messages(self, messages: Iterable[Message]) -> None:
+        self._repository.record_messages(messages)
+
+    @transaction.atomic
+    def mark_read(self, chat: Chat, user_id: int) -> None:
+        self._repository.mark_read(chat, user_id)
+        message_service.mark_read(chat.id, user_id)
+
+
+class MessageService(AbstractService[Message]):
+    def __init__(self, repository: MessageRepository = message_repo):
+        super().__init__(repository)
+
+    def history(
+        self, chat_id: int, before_id: Optional[int] = None, limit: int = 50
+    ) -> List[Message]:
+        """Newest first; `limit` is clamped to CHAT_HISTORY_MAX_PAGE_SIZE."""
+        limit = max(1, min(int(limit), CHAT_HISTORY_MAX_PAGE_SIZE))
+        return self._repository.history(chat_id, before_id, limit)
+
+    def reserve_ids(self, count: int) -> List[int]:
+        return self._repository.reserve_ids(count)
+
+    @transaction.atomic
+    def store(self, messages: List[Message]) -> List[Message]:
+        """
+        Inserts a batch and updates the inbox of its chats in one transaction.
+        Messages already stored (a retried or recovered batch) are skipped
+        entirely, so unread counters are never incremented twice; the chats
+        are locked first so two writers of the same batch run one after the
+        other.
+        """
+        chat_service.lock(message.chat_id for message in messages)
+        new = self._repository.insert_new(messages)
+        chat_service.record_messages(new)
+        return new
+
+    def mark_read(self, chat_id: int, reader_id: int) -> int:
+        return self._repository.mark_read(chat_id, reader_id)
+
+
+chat_service = ChatService()
+message_service = MessageService()
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from src.apps.chat.writer import message_writer
+
+
+@shared_task(ignore_result=True)
+def recover_chat_messages() -> int:
+    return message_writer.recover()
@@ -1,3 +1,281 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from src.apps.accounts.models import User
+from src.apps.chat.consumers import ChatConsumer, NotificationConsumer
+from src.apps.chat.models import Chat, Message
+from src.apps.chat.services import message_service
+from src.apps.chat.writer import message_writer
+
+
+class NotificationConsumerTest(TransactionTestCase):
+    async def test_receives_group_events_and_leaves_groups_on_disconnect(self):
+        communicator = WebsocketCommunicator(
+            NotificationConsumer.as_asgi(), "/ws/notifications/"
+        )
+        communicator.scope["user"] = SimpleNamespace(
+            username="reader", is_authenticated=True
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        layer = get_channel_layer()
+        await layer.group_send(
+            "reader", {"type": "send.notification", "data": {"text": "hi"}}
+        )
+        self.assertEqual(await communicator.receive_json_from(), {"text": "hi"})
+
+        await communicator.disconnect()
+        self.assertNotIn("reader", layer.groups)
+
+
+class ChatHistoryTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="a", email="a@test.com")
+        self.other = User.objects.create(username="b", email="b@test.com")
+        chat = Chat.objects.create(user1=self.user, user2=self.other)
+        self.messages = [
+            Message.objects.create(chat=chat, sender=self.user, text=str(i))
+            for i in range(5)
+        ]
+
+    async def history(self, communicator, **command):
+        await communicator.send_json_to({"command": "history", **command})
+        return await communicator.receive_json_from()
+
+    async def test_pages_backwards_with_before_id(self):
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+        communicator.scope["user"] = self.user
+        await communicator.connect()
+
+        first = await self.history(communicator, other_id=self.other.id, limit=3)
+        second = await self.history(
+            communicator, other_id=self.other.id, limit=3, before_id=first["before_id"]
+        )
+        await communicator.disconnect()
+
+        ids = [m.id for m in self.messages]
+        self.assertEqual([m["id"] for m in first["messages"]], ids[2:])
+        self.assertEqual([m["id"] for m in second["messages"]], ids[:2])
+        self.assertIsNone(second["before_id"])
+        self.assertEqual(first["messages"][0]["to"], self.other.id)
+
+    async def test_join_rejects_non_numeric_id(self):
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+        communicator.scope["user"] = self.user
+        await communicator.connect()
+
+        await communicator.send_json_to({"command": "join", "other_id": "abc"})
+        self.assertEqual(
+            await communicator.receive_json_from(),
+            {"error": "other_id required for join"},
+        )
+        await communicator.send_json_to({"command": "join", "other_id": self.other.id})
+        self.assertEqual(len((await communicator.receive_json_from())["messages"]), 5)
+        await communicator.disconnect()
+
+
+class MessageWriteBehindTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="a", email="a@test.com")
+        self.other = User.objects.create(username="b", email="b@test.com")
+
+    async def test_message_is_delivered_then_stored_in_a_batch(self):
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+        communicator.scope["user"] = self.user
+        await communicator.connect()
+
+        for text in ("one", "two"):
+            await communicator.send_json_to(
+                {"command": "message", "to": self.other.id, "text": text}
+            )
+        delivered = [
+            (await communicator.receive_json_from())["message"] for _ in range(2)
+        ]
+        await message_writer.flush()
+        await communicator.disconnect()
+
+        stored = await database_sync_to_async(
+            lambda: list(Message.objects.order_by("id").values("id", "text"))
+        )()
+        self.assertEqual(
+            stored, [{"id": m["id"], "text": m["text"]} for m in delivered]
+        )
+        self.assertEqual(delivered[0]["to"], self.other.id)
+
+    async def test_unknown_recipient_is_rejected(self):
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+        communicator.scope["user"] = self.user
+        await communicator.connect()
+        await communicator.send_json_to({"command": "message", "to": 0, "text": "x"})
+        self.assertEqual(
+            await communicator.receive_json_from(), {"error": "to and text required"}
+        )
+        await communicator.send_json_to(
+            {"command": "message", "to": self.other.id + 100, "text": "x"}
+        )
+        self.assertEqual(
+            await communicator.receive_json_from(), {"error": "recipient not found"}
+        )
+        await communicator.disconnect()
+
+    async def test_failed_batch_is_retried(self):
+        chat = await Chat.objects.acreate(user1=self.user, user2=self.other)
+        message = Message(
+            id=await message_writer.next_id(),
+            chat_id=chat.id,
+            sender_id=self.user.id,
+            text="hi",
+        )
+        store, attempts = message_writer._store, []
+
+        def flaky_store(batch):
+            attempts.append(batch)
+            if len(attempts) == 1:
+                raise OperationalError
+            store(batch)
+
+        with (
+            mock.patch.object(message_writer, "retry_delay", 0),
+            mock.patch.object(message_writer, "_store", flaky_store),
+        ):
+            await message_writer.submit(message)
+            await message_writer.flush()
+
+        self.assertEqual(attempts, [[message], [message]])
+        self.assertTrue(await Message.objects.filter(id=message.id).aexists())
+
+    async def test_batch_size_follows_settings(self):
+        chat = await Chat.objects.acreate(user1=self.user, user2=self.other)
+        messages = [
+            Message(
+                id=await message_writer.next_id(),
+                chat_id=chat.id,
+                sender_id=self.user.id,
+                text=text,
+            )
+            for text in ("one", "two")
+        ]
+        store, batches = message_writer._store, []
+
+        def recording_store(batch):
+            batches.append(batch)
+            store(batch)
+
+        with (
+            override_settings(CHAT_WRITE_BEHIND_BATCH_SIZE=1),
+            mock.patch.object(message_writer, "_store", recording_store),
+        ):
+            for message in messages:
+                await message_writer.submit(message)
+            await message_writer.flush()
+
+        self.assertEqual(batches, [[messages[0]], [messages[1]]])
+
+    async def test_bad_message_does_not_cost_the_batch(self):
+        chat = await Chat.objects.acreate(user1=self.user, user2=self.other)
+        good, bad = [
+            Message(
+                id=await message_writer.next_id(),
+                chat_id=chat.id,
+                sender_id=sender_id,
+                text="hi",
+            )
+            for sender_id in (self.user.id, self.other.id + 100)
+        ]
+
+        await message_writer.submit(good)
+        await message_writer.submit(bad)
+        await message_writer.flush()
+
+        stored = await database_sync_to_async(
+            lambda: list(Message.objects.values_list("id", flat=True))
+        )()
+        self.assertEqual(stored, [good.id])
+
+
+class ChatDeliveryTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="a", email="a@test.com")
+        self.other = User.objects.create(username="b", email="b@test.com")
+
+    async def connect(self, user):
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+        communicator.scope["user"] = user
+        await communicator.connect()
+        return communicator
+
+    async def test_every_device_of_both_participants_receives(self):
+        sender, sender_phone = await self.connect(self.user), await self.connect(
+            self.user
+        )
+        laptop, phone = await self.connect(self.other), await self.connect(self.other)
+
+        await sender.send_json_to(
+            {"command": "message", "to": self.other.id, "text": "hi"}
+        )
+        for communicator in (sender, sender_phone, laptop, phone):
+            received = await communicator.receive_json_from()
+            self.assertEqual(received["message"]["text"], "hi")
+
+        await message_writer.flush()
+        for communicator in (sender, sender_phone, laptop, phone):
+            await communicator.disconnect()
+
+
+class InboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="a", email="a@test.com")
+        cls.other = User.objects.create(username="b", email="b@test.com")
+        cls.third = User.objects.create(username="c", email="c@test.com")
+        cls.chat = Chat.objects.create(user1=cls.user, user2=cls.other)
+        cls.quiet = Chat.objects.create(user1=cls.user, user2=cls.third)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def send(self, chat, sender, *texts):
+        ids = message_service.reserve_ids(len(texts))
+        batch = [
+            Message(id=message_id, chat=chat, sender=sender, text=text)
+            for message_id, text in zip(ids, texts)
+        ]
+        message_service.store(batch)
+        return batch
+
+    def test_store_updates_last_message_and_unread_once(self):
+        batch = self.send(self.chat, self.other, "one", "two")
+        message_service.store(batch)  # retried batch
+
+        self.chat.refresh_from_db()
+        self.assertEqual(self.chat.last_message_id, batch[-1].id)
+        self.assertEqual(self.chat.last_message_text, "two")
+        self.assertEqual((self.chat.user1_unread, self.chat.user2_unread), (2, 0))
+
+    def test_inbox_is_one_query_and_read_resets_unread(self):
+        self.send(self.quiet, self.third, "old")
+        self.send(self.chat, self.other, "hi")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/chat/")
+        rows = response.data["results"]
+        self.assertEqual([row["id"] for row in rows], [self.chat.id, self.quiet.id])
+        self.assertEqual(rows[0]["user"]["username"], "b")
+        self.assertEqual(rows[0]["last_message"]["text"], "hi")
+        self.assertEqual(rows[0]["unread"], 1)
+
+        response = self.client.post(f"/api/chat/{self.chat.id}/read/")
+        self.assertEqual(response.status_code, 204)
+        self.chat.refresh_from_db()
+        self.assertEqual(self.chat.user1_unread, 0)
+        self.assertFalse(Message.objects.filter(chat=self.chat, is_read=False).exists())
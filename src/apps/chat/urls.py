@@ -1,16 +1,14 @@
-from django.urls import path
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
 from . import views
 
+router = DefaultRouter()
+
+router.register("", views.ChatAPIView, basename="chats")
+
 urlpatterns = [
-    path(
-        "",
-        views.ChatAPIView.as_view(
-            {
-                "post": "post",
-                "update": "update",
-            }
-        ),
-    ),
     path("message/", views.MessageAPIView.as_view({"post": "post"})),
     # path("message/", view=views.MessageAPIView),
+    path("", include(router.urls)),
 ]
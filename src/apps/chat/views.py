@@ -1,10 +1,48 @@
-from rest_framework.viewsets import ModelViewSet
-from src.apps.chat.models import Chat, Message
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import mixins, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from src.apps.chat.models import Message
+from src.apps.chat.serializers import ChatInboxSerializer
+from src.apps.chat.services import chat_service
+from src.utils.pagination import KeysetPagination
 
-class ChatAPIView(ModelViewSet):
-    def post(self, request):
-        return Chat.objects.create()
+
+class InboxPagination(KeysetPagination):
+    ordering = ("-updated_at", "-id")
+
+
+@extend_schema(tags=["chat"])
+class ChatAPIView(mixins.ListModelMixin, GenericViewSet):
+    """
+    Inbox: the user's chats, most recently active first. Rows are read from
+    the denormalized last message / unread fields, keyset paginated on
+    (updated_at, id).
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = ChatInboxSerializer
+    pagination_class = InboxPagination
+
+    def get_queryset(self):
+        return chat_service.inbox(self.request.user.id)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("cursor", str),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=True, methods=["post"], url_path="read")
+    def read(self, request, *args, **kwargs):
+        chat_service.mark_read(self.get_object(), request.user.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class MessageAPIView(ModelViewSet):
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import timedelta
+from typing import Deque, Dict, List, Optional
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis import RedisError
+
+from src.apps.chat.models import Message
+from src.apps.chat.services import MessageService, message_service
+from src.utils.bases.redis_config import RedisConfig, redis_config
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """
+    Write-behind persistence for chat messages, one per process.
+
+    `next_id()` hands out primary keys from blocks reserved up front in the
+    message id sequence (one query per `id_block_size` messages), so a
+    message can be fanned out before it is stored. `submit()` journals it in
+    a Redis hash and queues it; a background task inserts the queue every
+    `flush_interval` seconds with `MessageService.store`, which also updates
+    the chats' inbox fields, and then removes the batch from the journal.
+
+    A batch that failed on the connection goes back to the head of the queue
+    and is retried until it is stored. Ids are fixed before the first
+    attempt, so a retry of a batch that did commit is a no-op: delivery to
+    the database is at least once, storage exactly once. A batch that failed
+    for any other reason (e.g. a sender deleted meanwhile) is stored again
+    one message per transaction, and only the messages that still fail are
+    logged and dropped.
+
+    Messages still queued when the process dies stay in the journal;
+    `recover()` (celery beat) stores every entry older than
+    CHAT_JOURNAL_GRACE seconds. Without Redis (or with CHAT_JOURNAL_ENABLED
+    off) persistence is best effort: a crash loses the queue.
+    """
+
+    transient_errors = (OperationalError, InterfaceError)
+
+    journal_key = "chat:journal"
+
+    def __init__(
+        self,
+        service: MessageService = message_service,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        id_block_size: Optional[int] = None,
+        retry_delay: float = 0.5,
+        config: RedisConfig = redis_config,
+    ):
+        # None reads the CHAT_* setting on use
+        self._service = service
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._id_block_size = id_block_size
+        self.retry_delay = retry_delay
+        self._config = config
+        self._ids: Deque[int] = deque()
+        self._pending: Deque[Message] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._redis = None
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is None:
+            return settings.CHAT_WRITE_BEHIND_INTERVAL
+        return self._flush_interval
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size or settings.CHAT_WRITE_BEHIND_BATCH_SIZE
+
+    @property
+    def id_block_size(self) -> int:
+        return self._id_block_size or settings.CHAT_ID_BLOCK_SIZE
+
+    async def next_id(self) -> int:
+        self._bind_loop()
+        if not self._ids:
+            async with self._ids_lock:
+                if not self._ids:
+                    self._ids.extend(
+                        await database_sync_to_async(self._service.reserve_ids)(
+                            self.id_block_size
+                        )
+                    )
+        return self._ids.popleft()
+
+    async def submit(self, message: Message) -> None:
+        self._bind_loop()
+        if settings.CHAT_JOURNAL_ENABLED:
+            try:
+                await self._redis.hset(
+                    self.journal_key, message.id, json.dumps(self._dump(message))
+                )
+            except RedisError:
+                logger.warning("chat journal unavailable, %s not journaled", message.id)
+        self._pending.append(message)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Waits until everything submitted so far is stored."""
+        self._bind_loop()
+        while self._pending or (self._flusher and not self._flusher.done()):
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._run())
+            await self._flusher
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            batch = self._take(self.batch_size)
+            try:
+                await database_sync_to_async(self._store)(batch)
+            except self.transient_errors:
+                logger.exception(
+                    "storing %d chat messages failed, retrying", len(batch)
+                )
+                self._pending.extendleft(reversed(batch))
+                await asyncio.sleep(self.retry_delay)
+
+    def _take(self, count: int) -> List[Message]:
+        batch = []
+        while self._pending and len(batch) < count:
+            batch.append(self._pending.popleft())
+        return batch
+
+    def recover(self) -> int:
+        """
+        Stores journaled messages older than CHAT_JOURNAL_GRACE seconds, i.e.
+        those a dead process never wrote. Storing is idempotent, so entries
+        whose journal removal failed are only acknowledged again.
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.CHAT_JOURNAL_GRACE)
+        client = self._config.get_client()
+        batch, recovered = [], 0
+        for message_id, raw in client.hscan_iter(
+            self.journal_key, count=self.batch_size
+        ):
+            message = self._load(message_id, raw)
+            if message.created_at < cutoff:
+                batch.append(message)
+            if len(batch) == self.batch_size:
+                self._store(batch)
+                recovered, batch = recovered + len(batch), []
+        if batch:
+            self._store(batch)
+        return recovered + len(batch)
+
+    def _store(self, batch: List[Message]) -> None:
+        self._store_or_drop(batch)
+        if not settings.CHAT_JOURNAL_ENABLED:
+            return
+        try:
+            self._config.get_client().hdel(
+                self.journal_key, *[message.id for message in batch]
+            )
+        except RedisError:
+            # stored already: recover() will only drop them from the journal
+            logger.warning("chat journal unavailable, %d not removed", len(batch))
+
+    def _store_or_drop(self, batch: List[Message]) -> None:
+        try:
+            self._service.store(batch)
+            return
+        except self.transient_errors:
+            raise
+        except Exception:
+            if len(batch) > 1:
+                logger.exception(
+                    "storing %d chat messages failed, storing them one by one",
+                    len(batch),
+                )
+            else:
+                logger.exception("dropping chat message %s", batch[0].id)
+                return
+        # one bad row must not cost the rest of the batch; a retry after a
+        # transient error skips the messages stored here
+        for message in batch:
+            try:
+                self._service.store([message])
+            except self.transient_errors:
+                raise
+            except Exception:
+                logger.exception("dropping chat message %s", message.id)
+
+    @staticmethod
+    def _dump(message: Message) -> Dict:
+        return {
+            "chat_id": message.chat_id,
+            "sender_id": message.sender_id,
+            "text": message.text,
+            "created_at": message.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def _load(message_id: str, raw: str) -> Message:
+        data = json.loads(raw)
+        data["created_at"] = parse_datetime(data["created_at"])
+        return Message(id=int(message_id), **data)
+
+    def _bind_loop(self) -> None:
+        # asyncio primitives belong to one loop; tests start a new loop per test
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._ids_lock = asyncio.Lock()
+            self._flusher = None
+            self._redis = self._config.get_async_client()
+
+
+message_writer = MessageWriter()
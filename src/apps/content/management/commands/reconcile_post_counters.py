@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from redis import RedisError
+
+from src.apps.content.services.post import post_service
+
+
+class Command(BaseCommand):
+    help = "Recomputes Post.likes_count / Post.comments_count and fixes drifted rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = post_service.all().aggregate(last=Max("id"))["last"] or 0
+
+        fixed = 0
+        for id_from in range(0, last_id + 1, batch_size):
+            try:
+                fixed += post_service.reconcile_counters(id_from, id_from + batch_size)
+            except RedisError as e:
+                raise CommandError(f"Like counters could not be flushed: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} posts"))
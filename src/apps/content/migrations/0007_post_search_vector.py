@@ -0,0 +1,51 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:31
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    config = settings.POSTGRES_SEARCH_CONFIG
+    schema_editor.execute(
+        """
+        UPDATE content_post AS p SET search_vector =
+            setweight(to_tsvector(%s::regconfig, coalesce(p.title, '')), 'A')
+            || setweight(to_tsvector(%s::regconfig, coalesce(p.content, '')), 'B')
+            || setweight(to_tsvector(%s::regconfig, coalesce((
+                SELECT string_agg(t.name, ' ')
+                FROM content_tag AS t
+                JOIN content_post_tags AS pt ON pt.tag_id = t.id
+                WHERE pt.post_id = p.id
+            ), '')), 'C')
+        """,
+        [config, config, config],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0006_post_likes_count_post_comments_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="idx_post_search_vector"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0007_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="image",
+            name="variants",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="Производные изображения"
+            ),
+        ),
+    ]
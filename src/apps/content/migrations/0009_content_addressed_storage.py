@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:39
+
+import src.utils.storages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0008_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="digest",
+            field=models.CharField(
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="Хеш содержимого",
+            ),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="digest",
+            field=models.CharField(
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="Хеш содержимого",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="file",
+            name="file",
+            field=models.FileField(
+                storage=src.utils.storages.content_addressed_storage,
+                upload_to="files/",
+                verbose_name="Файл",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="image",
+            name="image",
+            field=models.ImageField(
+                storage=src.utils.storages.content_addressed_storage,
+                upload_to="images/",
+                verbose_name="Изображение",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0010_upload"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="postlike",
+            unique_together=None,
+        ),
+        migrations.RemoveField(
+            model_name="postlike",
+            name="like",
+        ),
+        migrations.RemoveField(
+            model_name="postlike",
+            name="post",
+        ),
+        migrations.DeleteModel(
+            name="PostComment",
+        ),
+        migrations.DeleteModel(
+            name="PostLike",
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0012_counter_flush"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="file",
+            name="digest",
+            field=models.CharField(
+                db_index=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                verbose_name="Хеш содержимого",
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from .comment import *  # noqa
+from .counter import *  # noqa
 from .image import *  # noqa
 from .like import *  # noqa
 from .post import *  # noqa
+from .upload import *  # noqa
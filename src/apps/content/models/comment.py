@@ -10,19 +10,3 @@ class Comment(AbstractAuditableModel, AbstractTimestampsModel):
         on_delete=models.CASCADE,
         related_name="comments",
     )
-
-
-class PostComment(models.Model):
-    post = models.ForeignKey(
-        Post,
-        on_delete=models.CASCADE,
-        related_name="post_comments",
-    )
-    comment = models.ForeignKey(
-        Comment,
-        on_delete=models.CASCADE,
-        related_name="post_comments",
-    )
-
-    class Meta:
-        unique_together = ("post", "comment")
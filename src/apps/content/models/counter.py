@@ -0,0 +1,8 @@
+from django.db import models
+
+
+class CounterFlush(models.Model):
+    """Batch of buffered counter deltas already applied (see BufferedCounter)."""
+
+    key = models.CharField(verbose_name="Ключ", max_length=255, unique=True)
+    created_at = models.DateTimeField(verbose_name="Время создания", auto_now_add=True)
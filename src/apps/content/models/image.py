@@ -1,10 +1,39 @@
 from django.db import models
 
+from src.utils.storages import content_addressed_storage
+
 
 class Image(models.Model):
-    image = models.ImageField(upload_to="images/", verbose_name="Изображение")
+    image = models.ImageField(
+        upload_to="images/",
+        storage=content_addressed_storage,
+        verbose_name="Изображение",
+    )
+    # sha256 of the file; null for images uploaded before content addressing
+    digest = models.CharField(
+        verbose_name="Хеш содержимого",
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+    )
+    # {"thumb": {"path": ..., "width": ..., "height": ...}, "thumb_webp": ...},
+    # filled off the request path by the generate_image_variants task
+    variants = models.JSONField(
+        verbose_name="Производные изображения", default=dict, blank=True
+    )
 
 
 class File(models.Model):
     title = models.CharField(max_length=50)
-    file = models.FileField(upload_to="files/", verbose_name="Файл")
+    # rows are per use (the title is theirs), identical content shares the blob
+    file = models.FileField(
+        upload_to="files/", storage=content_addressed_storage, verbose_name="Файл"
+    )
+    digest = models.CharField(
+        verbose_name="Хеш содержимого",
+        max_length=64,
+        null=True,
+        db_index=True,
+        editable=False,
+    )
@@ -17,19 +17,3 @@ class Like(AbstractAuditableModel, AbstractTimestampsModel):
                 fields=["post", "created_by"], name="unique_user_post_like"
             )
         ]
-
-
-class PostLike(models.Model):
-    post = models.ForeignKey(
-        Post,
-        on_delete=models.CASCADE,
-        related_name="post_likes",
-    )
-    like = models.ForeignKey(
-        Like,
-        on_delete=models.CASCADE,
-        related_name="post_likes",
-    )
-
-    class Meta:
-        unique_together = ("post", "like")
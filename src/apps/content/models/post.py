@@ -1,6 +1,8 @@
 from src.apps.content.models.tag import Tag
 from src.apps.content.models.image import Image
 from src.utils.bases.models import AbstractAuditableModel, AbstractTimestampsModel
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -15,6 +17,18 @@ class Post(AbstractTimestampsModel, AbstractAuditableModel):
 
     tags = models.ManyToManyField(Tag, related_name="posts", blank=True)
 
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
+    # title (A) + content (B) + tag names (C), see PostRepository.refresh_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="idx_post_created_at_id"),
+            GinIndex(fields=["search_vector"], name="idx_post_search_vector"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -0,0 +1,39 @@
+import uuid
+
+from django.db import models
+
+from src.apps.content.models.image import File
+from src.utils.bases.models import AbstractAuditableModel, AbstractTimestampsModel
+
+
+class Upload(AbstractAuditableModel, AbstractTimestampsModel):
+    """Resumable chunked upload; becomes a `File` once finalized."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Загружается"
+        COMPLETE = "complete", "Завершена"
+
+    updated_by = None
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(verbose_name="Название", max_length=50)
+    filename = models.CharField(verbose_name="Имя файла", max_length=255)
+    size = models.PositiveBigIntegerField(verbose_name="Размер")
+    offset = models.PositiveBigIntegerField(verbose_name="Получено байт", default=0)
+    checksum = models.CharField(verbose_name="SHA-256", max_length=64)
+    status = models.CharField(
+        verbose_name="Статус",
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    file = models.ForeignKey(
+        File,
+        on_delete=models.SET_NULL,
+        related_name="uploads",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "updated_at"])]
@@ -1,4 +1,4 @@
-from src.apps.content.models.comment import Comment, PostComment
+from src.apps.content.models.comment import Comment
 from src.utils.bases.repositories import AbstractRepository
 
 
@@ -6,9 +6,4 @@ class CommentRepository(AbstractRepository[Comment]):
     model = Comment
 
 
-class PostCommentRepository(AbstractRepository[PostComment]):
-    model = PostComment
-
-
 comment_repo = CommentRepository()
-post_comment_repo = PostCommentRepository()
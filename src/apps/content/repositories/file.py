@@ -0,0 +1,9 @@
+from src.apps.content.models.image import File
+from src.utils.bases.repositories import AbstractRepository
+
+
+class FileRepository(AbstractRepository[File]):
+    model = File
+
+
+file_repo = FileRepository()
@@ -1,14 +1,29 @@
-from src.apps.content.models.like import Like, PostLike
+from typing import Iterable, Set
+
+from src.apps.content.models.like import Like
 from src.utils.bases.repositories import AbstractRepository
 
 
 class LikeRepository(AbstractRepository[Like]):
     model = Like
 
+    def liked_post_ids(self, user_id: int, post_ids: Iterable[int]) -> Set[int]:
+        return set(
+            self.filter(created_by_id=user_id, post_id__in=post_ids).values_list(
+                "post_id", flat=True
+            )
+        )
+
+    def like(self, post_id: int, user_id: int) -> bool:
+        return (
+            self.insert_ignoring_conflicts(
+                ("post", "created_by"), post_id=post_id, created_by_id=user_id
+            )
+            is not None
+        )
 
-class PostLikeRepository(AbstractRepository[PostLike]):
-    model = PostLike
+    def unlike(self, post_id: int, user_id: int) -> bool:
+        return bool(self.delete_returning(post_id=post_id, created_by_id=user_id))
 
 
 like_repo = LikeRepository()
-post_like_repo = PostLikeRepository()
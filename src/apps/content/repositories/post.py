@@ -1,10 +1,136 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+from src.apps.content.models.comment import Comment
+from src.apps.content.models.like import Like
 from src.apps.content.models.post import Post, PostImage
+from src.apps.content.models.tag import Tag
 from src.utils.bases.repositories import AbstractRepository
+from src.utils.conts import FEED_COMMENTS_LIMIT
+
+
+def _count_by_post(model) -> Coalesce:
+    subquery = (
+        model.objects.filter(post_id=OuterRef("pk"))
+        .order_by()
+        .values("post_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+def _post_search_vector() -> SearchVector:
+    config = settings.POSTGRES_SEARCH_CONFIG
+    tag_names = (
+        Tag.objects.filter(posts=OuterRef("pk"))
+        .order_by()
+        .values("posts")
+        .annotate(names=StringAgg("name", " "))
+        .values("names")
+    )
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("content", weight="B", config=config)
+        + SearchVector(Subquery(tag_names), weight="C", config=config)
+    )
 
 
 class PostRepository(AbstractRepository[Post]):
     model = Post
 
+    def feed(self, comments_limit: int = FEED_COMMENTS_LIMIT) -> QuerySet[Post]:
+        """
+        Queryset for feed pages: constant number of queries regardless of page size.
+        The stored tsvector is only used in WHERE, so it is never loaded.
+        """
+        comments_qs = Comment.objects.select_related("created_by").order_by(
+            "-created_at", "-id"
+        )[:comments_limit]
+        return (
+            self.all()
+            .defer("search_vector")
+            .select_related("created_by")
+            .prefetch_related(
+                "images",
+                "tags",
+                Prefetch("comments", queryset=comments_qs, to_attr="latest_comments"),
+            )
+        )
+
+    def search(self, text: str) -> QuerySet[Post]:
+        """
+        Feed queryset matching `text`, annotated with `rank` (double precision,
+        so it survives a round trip through a keyset cursor unchanged). The GIN
+        index finds the matches, but rank is computed, so every page still
+        scores and sorts all of them; keyset pages only avoid COUNT and OFFSET.
+        """
+        if connection.vendor != "postgresql":
+            return (
+                self.feed()
+                .annotate(rank=Value(0.0, FloatField()))
+                .filter(Q(title__icontains=text) | Q(content__icontains=text))
+            )
+        query = SearchQuery(
+            text, search_type="websearch", config=settings.POSTGRES_SEARCH_CONFIG
+        )
+        return (
+            self.feed()
+            .filter(search_vector=query)
+            .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+        )
+
+    def refresh_search_vector(self, post_ids: Iterable[int]) -> int:
+        if connection.vendor != "postgresql":
+            return 0
+        return self.filter(id__in=list(post_ids)).update(
+            search_vector=_post_search_vector()
+        )
+
+    def increment_counters(self, post_id: int, **deltas: int) -> int:
+        """
+        Atomic `counter = counter + delta` in a single UPDATE, clamped at zero.
+        """
+        return self.filter(id=post_id).update(
+            **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+        )
+
+    def reconcile_counters(self, id_from: int, id_to: int) -> int:
+        """
+        Recomputes likes_count / comments_count for posts with id in [id_from, id_to)
+        and rewrites only the rows that drifted.
+        """
+        likes, comments = _count_by_post(Like), _count_by_post(Comment)
+        drifted = (
+            self.filter(id__gte=id_from, id__lt=id_to)
+            .annotate(actual_likes=likes, actual_comments=comments)
+            .filter(
+                ~Q(likes_count=F("actual_likes"))
+                | ~Q(comments_count=F("actual_comments"))
+            )
+            .values("id")
+        )
+        return self.filter(id__in=drifted).update(
+            likes_count=likes, comments_count=comments
+        )
+
 
 class PostImageRepository(AbstractRepository[PostImage]):
     model = PostImage
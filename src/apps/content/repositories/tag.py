@@ -1,9 +1,18 @@
+from typing import Iterable, List
+
 from src.apps.content.models.tag import Tag
 from src.utils.bases.repositories import AbstractRepository
+from src.utils.resolvers import BulkNameResolver
 
 
 class TagRepository(AbstractRepository[Tag]):
     model = Tag
 
+    def __init__(self):
+        self._resolver = BulkNameResolver(self.model, "name")
+
+    def resolve_ids(self, names: Iterable[str]) -> List[int]:
+        return self._resolver.resolve_ids(names)
+
 
 tag_repo = TagRepository()
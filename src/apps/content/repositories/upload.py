@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from src.apps.content.models.upload import Upload
+from src.utils.bases.repositories import AbstractRepository
+
+
+class UploadRepository(AbstractRepository[Upload]):
+    model = Upload
+
+    def lock(self, upload_id: UUID, user_id: int) -> Optional[Upload]:
+        """Row lock serializing chunk writes / finalize of one upload."""
+        return (
+            self.filter(id=upload_id, created_by_id=user_id).select_for_update().first()
+        )
+
+    def stale_ids(self, updated_before: datetime) -> list[UUID]:
+        return list(
+            self.filter(
+                status=Upload.Status.PENDING, updated_at__lt=updated_before
+            ).values_list("id", flat=True)
+        )
+
+
+upload_repo = UploadRepository()
@@ -1,18 +1,55 @@
+import re
+
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
 from src.apps.accounts.serializers.accounts import UserSerializer
 from src.apps.content.services.post import post_service
 from src.apps.content.services.tag import tag_service
+from src.apps.content.services.image import image_service
 from src.apps.content.services.like import like_service
 from src.apps.content.services.comment import comment_service
 from src.apps.content.models.post import Post
 from src.apps.content.models.comment import Comment
+from src.apps.content.models.upload import Upload
+from src.apps.content.services.counters import post_likes_counter
+from src.apps.content.services.upload import upload_service
+from src.utils.bases.serializers import PreparedListSerializer, PreparedSerializerMixin
 from src.utils.functions import raise_validation_error_detail
+from src.utils.images import accepts_webp
+
+
+class TagListField(ManyRelatedField):
+    """Resolves the whole list of tag names at once instead of tag by tag."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        return tag_service.resolve_ids(
+            self.child_relation.to_name(item) for item in data
+        )
 
 
 class TagField(serializers.SlugRelatedField):
+    """Tag name in, tag id out; unknown names are created."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return TagListField(**list_kwargs)
+
+    def to_name(self, data) -> str:
+        if not isinstance(data, str) or not data.strip():
+            self.fail("invalid")
+        return data.strip()
+
     def to_internal_value(self, data):
-        obj, created = tag_service.get_or_create(name=data)
-        return obj
+        return tag_service.resolve_ids([self.to_name(data)])[0]
 
 
 class TagSerializer(serializers.Serializer):
@@ -49,11 +86,34 @@ class PostSerializer(serializers.ModelSerializer):
         images = validated_data.pop("images")
         instance = super().update(instance=instance, validated_data=validated_data)
         post_service._set_images(instance=instance, images=images)
+        post_service.refresh_search_vector([instance.id])
         return instance
 
 
+class ImageVariantField(serializers.Field):
+    """
+    URL of a stored derivative of an `Image` (WebP when the client accepts
+    it), falling back to the original until the derivatives are rendered.
+    """
+
+    def __init__(self, variant: str, **kwargs):
+        self.variant = variant
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        url = image_service.variant_url(value, self.variant, accepts_webp(request))
+        if url is None or request is None:
+            return url
+        return request.build_absolute_uri(url)
+
+
 class ImageSerializer(serializers.Serializer):
     image = serializers.ImageField()
+    medium = ImageVariantField(variant="medium")
+    thumbnail = ImageVariantField(variant="thumb")
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -64,19 +124,33 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ("id", "content", "created_by")
 
 
-class ListPostSerializer(serializers.Serializer):
+class ListPostSerializer(PreparedSerializerMixin, serializers.Serializer):
     id = serializers.IntegerField()
     title = serializers.CharField()
     content = serializers.CharField()
     images = ImageSerializer(many=True)
     tags = TagSerializer(many=True)
-    comments = CommentSerializer(many=True, read_only=True)
-    likes = serializers.SerializerMethodField()
+    comments = CommentSerializer(source="latest_comments", many=True, read_only=True)
+    likes = serializers.IntegerField(source="likes_count")
+    comments_count = serializers.IntegerField()
+    liked_by_me = serializers.SerializerMethodField()
     created_by = UserSerializer()
     created_at = serializers.DateTimeField()
 
-    def get_likes(self, value):
-        return value.likes.count()
+    class Meta:
+        list_serializer_class = PreparedListSerializer
+
+    def prepare(self, instances):
+        post_likes_counter.merge(instances)
+        user = self.request_user()
+        self._liked_ids = (
+            like_service.liked_post_ids(user.id, [post.id for post in instances])
+            if user.is_authenticated
+            else set()
+        )
+
+    def get_liked_by_me(self, obj) -> bool:
+        return obj.id in self._liked_ids
 
 
 class CreateLikeSerializer(serializers.Serializer):
@@ -111,4 +185,38 @@ class CommentSerializer(serializers.Serializer):
 
 
 class LikeSerializer(serializers.Serializer):
-    post_id = serializers.IntegerField()
\ No newline at end of file
+    post_id = serializers.IntegerField()
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    created_by = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    file_id = serializers.IntegerField(read_only=True, allow_null=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Upload
+        fields = (
+            "id",
+            "title",
+            "filename",
+            "size",
+            "checksum",
+            "offset",
+            "status",
+            "file_id",
+            "chunk_size",
+            "created_by",
+        )
+        read_only_fields = ("id", "offset", "status")
+
+    def get_chunk_size(self, obj) -> int:
+        return settings.CHUNKED_UPLOAD_CHUNK_SIZE
+
+    def validate_checksum(self, value: str) -> str:
+        value = value.lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", value):
+            raise_validation_error_detail("Expected a hex SHA-256 digest.")
+        return value
+
+    def create(self, validated_data):
+        return upload_service.start(**validated_data)
@@ -1,16 +1,25 @@
+from django.db import transaction
 from src.apps.content.models.comment import Comment
 from src.apps.content.repositories.comment import CommentRepository, comment_repo
-from src.apps.content.services.post_comment import post_comment_service
+from src.apps.content.services.post import post_service
+from src.apps.notifications.services import enqueue_event
 from src.utils.bases.services import AbstractService
+from src.utils.conts import OutboxTopic
 
 
 class CommentService(AbstractService[Comment]):
     def __init__(self, repository: CommentRepository = comment_repo):
         super().__init__(repository)
 
+    @transaction.atomic
     def create(self, **kwargs):
         instance = super().create(**kwargs)
-        post_comment_service.create(post_id=instance.post.id, comment_id=instance.id)
+        post_service.increment_counters(instance.post_id, comments_count=1)
+        enqueue_event(
+            OutboxTopic.POST_COMMENTED,
+            post_id=instance.post_id,
+            actor_id=instance.created_by_id,
+        )
         return instance
 
 
@@ -0,0 +1,4 @@
+from src.apps.content.models.post import Post
+from src.utils.counters import BufferedCounter
+
+post_likes_counter = BufferedCounter(Post, "likes_count")
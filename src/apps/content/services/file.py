@@ -0,0 +1,21 @@
+from src.apps.content.models.image import File
+from src.apps.content.repositories.file import FileRepository, file_repo
+from src.utils.bases.services import AbstractService
+from src.utils.storages import save_content_addressed
+
+
+class FileService(AbstractService[File]):
+    def __init__(self, repository: FileRepository = file_repo):
+        super().__init__(repository)
+
+    def create(self, **kwargs) -> File:
+        """
+        New row per upload, so its title stays its own; identical content is
+        stored once and shared by every row that has it.
+        """
+        upload = kwargs.pop("file")
+        name, digest = save_content_addressed(File._meta.get_field("file"), upload)
+        return self._repository.create(file=name, digest=digest, **kwargs)
+
+
+file_service = FileService()
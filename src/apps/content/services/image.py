@@ -1,11 +1,121 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
 from src.apps.content.models.image import Image
 from src.apps.content.repositories.image import ImageRepository, image_repo
 from src.utils.bases.services import AbstractService
+from src.utils.images import WEBP_SUFFIX, render_derivatives
+from src.utils.storages import save_content_addressed
+
+logger = logging.getLogger(__name__)
 
 
 class ImageService(AbstractService[Image]):
+    VARIANTS_DIR = "images/variants"
+
     def __init__(self, repository: ImageRepository = image_repo):
         super().__init__(repository)
 
+    def create(self, **kwargs) -> Image:
+        """
+        Reuses the row of an identical image uploaded before, so duplicates
+        are neither stored twice nor sent through the variants pipeline.
+        """
+        upload = kwargs.pop("image")
+        name, digest = save_content_addressed(Image._meta.get_field("image"), upload)
+        instance, created = self._repository.get_or_create(
+            digest=digest, defaults={"image": name, **kwargs}
+        )
+        if created:
+            self.schedule_variants([instance.id])
+        return instance
+
+    def create_many(self, uploads: Sequence[Any]) -> List[Image]:
+        """
+        Batched `create`: files are written concurrently by a thread pool, then
+        one SELECT finds already stored digests and one INSERT adds the rest
+        (ON CONFLICT on digest, so a concurrent identical upload is reused).
+        Returns one image per upload, in order.
+        """
+        if not uploads:
+            return []
+        field = Image._meta.get_field("image")
+        workers = min(len(uploads), settings.MEDIA_INGEST_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            stored = list(
+                pool.map(lambda upload: save_content_addressed(field, upload), uploads)
+            )
+
+        names = {digest: name for name, digest in stored}
+        by_digest = {
+            image.digest: image for image in self.filter(digest__in=list(names))
+        }
+        new = [
+            Image(image=name, digest=digest)
+            for digest, name in names.items()
+            if digest not in by_digest
+        ]
+        if new:
+            created = self._repository.bulk_create(
+                new,
+                update_conflicts=True,
+                unique_fields=["digest"],
+                update_fields=["digest"],
+            )
+            by_digest.update((image.digest, image) for image in created)
+            self.schedule_variants([image.id for image in created])
+        return [by_digest[digest] for _, digest in stored]
+
+    def schedule_variants(self, image_ids: Sequence[int]) -> None:
+        """Derivatives are rendered by celery once the images are committed."""
+        from src.apps.content.tasks import generate_image_variants
+
+        for image_id in image_ids:
+            transaction.on_commit(
+                lambda image_id=image_id: generate_image_variants.delay(image_id)
+            )
+
+    def generate_variants(self, image_id: int) -> Dict[str, dict]:
+        image = self.get(id=image_id)
+        if image is None or not image.image:
+            return {}
+
+        storage = image.image.storage
+        variants = {}
+        with image.image.open("rb") as source:
+            for derivative in render_derivatives(
+                source,
+                settings.IMAGE_VARIANTS,
+                settings.IMAGE_VARIANT_WEBP_QUALITY,
+            ):
+                path = f"{self.VARIANTS_DIR}/{derivative.name}.{derivative.extension}"
+                variants[derivative.name] = {
+                    "path": storage.save(path, ContentFile(derivative.content)),
+                    "width": derivative.width,
+                    "height": derivative.height,
+                }
+
+        self._repository.update_with_query({"variants": variants}, id=image.id)
+        return variants
+
+    @staticmethod
+    def variant_url(image: Image, name: str, webp: bool = False) -> Optional[str]:
+        """
+        URL of the `name` derivative (its WebP flavour when `webp`), or of the
+        original while the derivatives are not rendered yet.
+        """
+        if not image.image:
+            return None
+        variants = image.variants or {}
+        variant = (webp and variants.get(name + WEBP_SUFFIX)) or variants.get(name)
+        if variant is None:
+            return image.image.url
+        return image.image.storage.url(variant["path"])
+
 
 image_service = ImageService()
@@ -1,26 +1,52 @@
+from typing import Iterable, Set
 from src.apps.content.models.like import Like
 from src.apps.content.repositories.like import LikeRepository, like_repo
-from src.apps.content.services.post_like import post_like_service
+from src.apps.content.services.counters import post_likes_counter
 from src.utils.bases.services import AbstractService
 from django.db import transaction
-from src.apps.notifications.services import PostLikeNotify
+from src.apps.notifications.services import enqueue_event
+from src.utils.conts import OutboxTopic
 
 
 class LikeService(AbstractService[Like]):
     def __init__(self, repository: LikeRepository = like_repo):
         super().__init__(repository)
 
+    def liked_post_ids(self, user_id: int, post_ids: Iterable[int]) -> Set[int]:
+        return self._repository.liked_post_ids(user_id, post_ids)
+
+    @transaction.atomic
+    def like(self, post_id: int, user_id: int) -> bool:
+        """
+        Idempotent like in one statement; counter and notification follow only
+        when a row was actually inserted.
+        """
+        liked = self._repository.like(post_id, user_id)
+        if liked:
+            post_likes_counter.incr_on_commit(post_id, 1)
+            enqueue_event(OutboxTopic.POST_LIKED, post_id=post_id, actor_id=user_id)
+        return liked
+
+    def unlike(self, post_id: int, user_id: int) -> bool:
+        unliked = self._repository.unlike(post_id, user_id)
+        if unliked:
+            post_likes_counter.incr_on_commit(post_id, -1)
+        return unliked
+
     @transaction.atomic
     def create(self, **kwargs):
         instance = super().create(**kwargs)
-        post_like = post_like_service.create(post_id=kwargs.get("post_id"), like=instance)
-        obj = PostLikeNotify(post_like.post.created_by, instance.created_by)
-        obj.notify()
+        post_likes_counter.incr_on_commit(instance.post_id, 1)
+        enqueue_event(
+            OutboxTopic.POST_LIKED,
+            post_id=instance.post_id,
+            actor_id=instance.created_by_id,
+        )
         return instance
 
     @transaction.atomic
     def delete(self, instance, *args, **kwargs):
-        post_like_service.filter(post=kwargs.get("post_id"), like=instance).delete()
+        post_likes_counter.incr_on_commit(instance.post_id, -1)
         return super().delete(instance)
 
 
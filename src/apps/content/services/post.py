@@ -1,37 +1,94 @@
-from typing import Any, List
-from src.apps.content.models.tag import Tag
-from src.apps.content.models.post import Post, PostImage
+from typing import Any, List, Optional, Sequence
+from django.db import transaction
+from django.db.models import QuerySet
+from src.apps.content.models.post import Post
+from src.apps.content.services.counters import post_likes_counter
 from src.apps.content.services.image import image_service
 from src.apps.content.repositories.post import PostRepository, post_repo
 from src.utils.bases.services import AbstractService
 from src.apps.content.services.post_image import post_image_service
+from src.apps.content.services.timeline import timeline_service
 
 
 class PostService(AbstractService[Post]):
     def __init__(self, repository: PostRepository = post_repo):
         super().__init__(repository)
 
+    def feed(self) -> QuerySet[Post]:
+        return self._repository.feed()
+
+    def feed_by_ids(self, ids: Sequence[int]) -> List[Post]:
+        """Hydrates timeline ids with one batched feed query, keeping their order."""
+        posts = self.feed().in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
+
+    def timeline_ids(
+        self, position: Optional[Sequence], limit: int, tag_id: Optional[int] = None
+    ) -> Optional[List[int]]:
+        """
+        Post ids of the next timeline page, or None when the DB must serve it.
+        A cold timeline is rebuilt in the background.
+        """
+        from src.apps.content.tasks import rebuild_timeline
+
+        key = timeline_service.key_for(tag_id)
+        ids = timeline_service.read(key, position, limit)
+        if ids is None and timeline_service.claim_rebuild(key):
+            transaction.on_commit(lambda: rebuild_timeline.delay(tag_id))
+        return ids
+
+    def search(self, text: str) -> QuerySet[Post]:
+        return self._repository.search(text)
+
+    def refresh_search_vector(self, post_ids: Sequence[int]) -> int:
+        return self._repository.refresh_search_vector(post_ids)
+
+    def increment_counters(self, post_id: int, **deltas: int) -> int:
+        return self._repository.increment_counters(post_id, **deltas)
+
+    def reconcile_counters(self, id_from: int, id_to: int) -> int:
+        """
+        Recounts under the like counter's flush lock, right after a flush, so
+        buffered deltas are neither missed nor applied again on top of it.
+        Raises RedisError when the counter cannot be flushed.
+        """
+        with post_likes_counter.flushed():
+            return self._repository.reconcile_counters(id_from, id_to)
+
+    @transaction.atomic
     def create(self, **kwargs):
+        from src.apps.content.tasks import fan_out_post
+
         images = kwargs.pop("images")
         tags = kwargs.pop("tags")
         instance = super().create(**kwargs)
         self._set_images(instance=instance, images=images)
         self._set_tags(instance=instance, tags=tags)
+        self.refresh_search_vector([instance.id])
+        transaction.on_commit(lambda: fan_out_post.delay(instance.id))
         return instance
 
     def update(self, **kwargs):
         images = kwargs.pop("images")
         instance = super().update(**kwargs)
         self._set_images(instance=instance, images=images)
+        self.refresh_search_vector([instance.id])
         return instance
 
-    def _set_images(self, instance: Post, images: List[Any]):
-        img_instances = [image_service.create(image=img) for img in images]
-        post_image_service.bulk_create(
-            [PostImage(post=instance, image=img_obj) for img_obj in img_instances]
+    @transaction.atomic
+    def delete(self, instance: Post) -> None:
+        """Deletes the post and, once committed, drops it from its timelines."""
+        keys = timeline_service.audiences(
+            instance.created_by_id, instance.tags.values_list("id", flat=True)
         )
+        post_id = instance.id
+        super().delete(instance)
+        transaction.on_commit(lambda: timeline_service.remove(post_id, keys))
+
+    def _set_images(self, instance: Post, images: List[Any]):
+        post_image_service.link(instance, image_service.create_many(images))
 
-    def _set_tags(self, instance: Post, tags: List[Tag]):
+    def _set_tags(self, instance: Post, tags: List[int]):
         instance.tags.set(tags)
 
 
@@ -1,4 +1,7 @@
-from src.apps.content.models.post import PostImage
+from typing import Iterable
+
+from src.apps.content.models.image import Image
+from src.apps.content.models.post import Post, PostImage
 from src.apps.content.repositories.post import PostImageRepository, post_image_repo
 from src.utils.bases.services import AbstractService
 
@@ -7,5 +10,13 @@ class PostImageService(AbstractService[PostImage]):
     def __init__(self, repository: PostImageRepository = post_image_repo):
         super().__init__(repository)
 
+    def link(self, post: Post, images: Iterable[Image]) -> None:
+        """One INSERT for all links; images already on the post are skipped."""
+        unique = {image.id: image for image in images}.values()
+        self._repository.bulk_create(
+            [PostImage(post=post, image=image) for image in unique],
+            ignore_conflicts=True,
+        )
+
 
 post_image_service = PostImageService()
@@ -1,3 +1,5 @@
+from typing import Iterable, List
+
 from src.apps.content.models.tag import Tag
 from src.apps.content.repositories.tag import TagRepository, tag_repo
 from src.utils.bases.services import AbstractService
@@ -7,5 +9,9 @@ class TagService(AbstractService[Tag]):
     def __init__(self, repository: TagRepository = tag_repo):
         super().__init__(repository)
 
+    def resolve_ids(self, names: Iterable[str]) -> List[int]:
+        """Tag ids for `names`, creating missing tags; ~2 queries per call."""
+        return self._repository.resolve_ids(names)
+
 
 tag_service = TagService()
@@ -0,0 +1,147 @@
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from redis import RedisError
+
+from src.utils.bases.redis_config import RedisConfig, redis_config
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineService:
+    """
+    Fan-out-on-write timelines: capped Redis sorted sets of post ids scored by
+    created_at. Reads cost O(page size); `None` means the caller must fall back
+    to the database (Redis unavailable, key cold, or page past the capped tail).
+
+    A key is only served once it was rebuilt from the database (it is then in
+    READY_KEY), so a flushed or restarted Redis never yields a truncated feed.
+    """
+
+    GLOBAL_KEY = "timeline:global"
+    TAG_KEY = "timeline:tag:{}"
+    USER_KEY = "timeline:user:{}"
+    READY_KEY = "timeline:ready"
+    # members sharing the cursor score that may have to be skipped on read
+    TIE_SLACK = 16
+
+    def __init__(
+        self,
+        config: RedisConfig = redis_config,
+        max_length: int = settings.TIMELINE_MAX_LENGTH,
+    ):
+        self._config = config
+        self.max_length = max_length
+
+    def key_for(self, tag_id: Optional[int] = None) -> str:
+        return self.GLOBAL_KEY if tag_id is None else self.TAG_KEY.format(tag_id)
+
+    def audiences(self, author_id: Optional[int], tag_ids: Iterable[int]) -> List[str]:
+        keys = [self.GLOBAL_KEY]
+        keys += [self.TAG_KEY.format(tag_id) for tag_id in tag_ids]
+        keys += [self.USER_KEY.format(uid) for uid in self.follower_ids(author_id)]
+        return keys
+
+    def follower_ids(self, author_id: Optional[int]) -> List[int]:
+        """There is no follow graph yet, so there are no home timelines to fill."""
+        return []
+
+    def push(
+        self,
+        post_id: int,
+        created_at: datetime,
+        author_id: Optional[int],
+        tag_ids: Iterable[int],
+    ) -> None:
+        score = created_at.timestamp()
+        try:
+            pipe = self._config.get_client().pipeline(transaction=False)
+            for key in self.audiences(author_id, tag_ids):
+                pipe.zadd(key, {post_id: score})
+                pipe.zremrangebyrank(key, 0, -self.max_length - 1)
+            pipe.execute()
+        except RedisError:
+            logger.exception("Timeline fan-out failed for post %s", post_id)
+
+    def rebuild(self, key: str, entries: Iterable[tuple[int, datetime]]) -> None:
+        """
+        Merges `entries` (post id, created_at) into the key and marks it ready.
+        Merging instead of replacing keeps posts pushed while the DB was read.
+        """
+        mapping = {post_id: created_at.timestamp() for post_id, created_at in entries}
+        try:
+            pipe = self._config.get_client().pipeline(transaction=False)
+            if mapping:
+                pipe.zadd(key, mapping)
+                pipe.zremrangebyrank(key, 0, -self.max_length - 1)
+            pipe.sadd(self.READY_KEY, key)
+            pipe.execute()
+        except RedisError:
+            logger.exception("Timeline rebuild failed for %s", key)
+
+    def claim_rebuild(self, key: str, ttl: int = 60) -> bool:
+        """Only one rebuild per key is scheduled while the key is cold."""
+        try:
+            return bool(
+                self._config.get_client().set(f"{key}:rebuilding", 1, nx=True, ex=ttl)
+            )
+        except RedisError:
+            return False
+
+    def remove(self, post_id: int, keys: Sequence[str]) -> None:
+        try:
+            pipe = self._config.get_client().pipeline(transaction=False)
+            for key in keys:
+                pipe.zrem(key, post_id)
+            pipe.execute()
+        except RedisError:
+            logger.exception("Timeline removal failed for post %s", post_id)
+
+    def read(
+        self, key: str, position: Optional[Sequence], limit: int
+    ) -> Optional[List[int]]:
+        """
+        Up to `limit` post ids strictly after `position` ((created_at, id) cursor)
+        in (-created_at, -id) order.
+        """
+        max_score, last_id = "+inf", None
+        if position is not None:
+            max_score, last_id = position[0].timestamp(), int(position[1])
+
+        try:
+            pipe = self._config.get_client().pipeline(transaction=False)
+            pipe.sismember(self.READY_KEY, key)
+            pipe.zcard(key)
+            pipe.zrevrangebyscore(
+                key,
+                max_score,
+                "-inf",
+                start=0,
+                num=limit + self.TIE_SLACK,
+                withscores=True,
+            )
+            ready, size, entries = pipe.execute()
+        except RedisError:
+            logger.warning("Timeline %s unavailable, falling back to DB", key)
+            return None
+
+        if not ready:
+            return None
+
+        entries = sorted(
+            ((score, int(member)) for member, score in entries), reverse=True
+        )
+        ids = [
+            post_id
+            for score, post_id in entries
+            if last_id is None or score < max_score or post_id < last_id
+        ][:limit]
+
+        if len(ids) < limit and size >= self.max_length:
+            return None
+        return ids
+
+
+timeline_service = TimelineService()
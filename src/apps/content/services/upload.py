@@ -0,0 +1,157 @@
+import hashlib
+import os
+from datetime import timedelta
+from typing import BinaryIO
+from uuid import UUID
+
+from django.conf import settings
+from django.core.files import File as DjangoFile
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+
+from src.apps.content.models.upload import Upload
+from src.apps.content.repositories.upload import UploadRepository, upload_repo
+from src.apps.content.services.file import file_service
+from src.utils.bases.services import AbstractService
+from src.utils.functions import raise_validation_error_detail
+
+
+class UploadService(AbstractService[Upload]):
+    """
+    Resumable uploads: bytes are appended to a temp file chunk by chunk at
+    the offset the server acknowledged last, so an interrupted transfer
+    resumes from there. `finalize` verifies the SHA-256 and stores the
+    result as a content-addressed `File`.
+    """
+
+    copy_buffer_size = 64 * 1024
+
+    def __init__(self, repository: UploadRepository = upload_repo):
+        super().__init__(repository)
+
+    @staticmethod
+    def temp_path(upload_id: UUID) -> str:
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload_id}.part")
+
+    def start(self, **kwargs) -> Upload:
+        if kwargs["size"] > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise_validation_error_detail(
+                {"size": f"Max upload size is {settings.CHUNKED_UPLOAD_MAX_SIZE}"}
+            )
+        upload = super().create(**kwargs)
+        os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+        open(self.temp_path(upload.id), "wb").close()
+        return upload
+
+    @transaction.atomic
+    def write_chunk(
+        self, upload_id: UUID, user_id: int, offset: int, stream: BinaryIO
+    ) -> Upload:
+        """
+        Appends at most CHUNKED_UPLOAD_CHUNK_SIZE bytes from `stream`. `offset`
+        must equal the acknowledged offset; a partially written previous
+        chunk past it is discarded.
+        """
+        upload = self._get_pending(upload_id, user_id)
+        if offset != upload.offset:
+            raise_validation_error_detail(
+                {
+                    "offset": f"Expected offset {upload.offset}",
+                    "expected": upload.offset,
+                }
+            )
+
+        limit = min(settings.CHUNKED_UPLOAD_CHUNK_SIZE, upload.size - offset)
+        written = 0
+        with open(self.temp_path(upload.id), "r+b") as part:
+            part.truncate(offset)
+            part.seek(offset)
+            while written <= limit:
+                data = stream.read(min(self.copy_buffer_size, limit - written + 1))
+                if not data:
+                    break
+                part.write(data)
+                written += len(data)
+            if written > limit:
+                part.truncate(offset)
+                raise_validation_error_detail(
+                    {"chunk": f"Chunk exceeds {limit} bytes for this offset"}
+                )
+
+        upload.offset = offset + written
+        self._repository.save(upload, update_fields=["offset", "updated_at"])
+        return upload
+
+    def finalize(self, upload_id: UUID, user_id: int) -> Upload:
+        with transaction.atomic():
+            upload = self._repository.lock(upload_id, user_id)
+            if upload is None:
+                raise NotFound("Upload not found")
+            if upload.status == Upload.Status.COMPLETE:
+                return upload
+            if upload.offset != upload.size:
+                raise_validation_error_detail(
+                    {"offset": f"Received {upload.offset} of {upload.size} bytes"}
+                )
+
+            path = self.temp_path(upload.id)
+            if self._sha256(path) == upload.checksum:
+                with open(path, "rb") as part:
+                    upload.file = file_service.create(
+                        title=upload.title, file=DjangoFile(part, name=upload.filename)
+                    )
+                upload.status = Upload.Status.COMPLETE
+                self._repository.save(
+                    upload, update_fields=["file", "status", "updated_at"]
+                )
+                transaction.on_commit(lambda: self._remove_temp(upload.id))
+                return upload
+
+            # committed before raising: the client restarts from zero
+            open(path, "wb").close()
+            upload.offset = 0
+            self._repository.save(upload, update_fields=["offset", "updated_at"])
+
+        raise_validation_error_detail(
+            {"checksum": "Checksum mismatch, upload restarted from zero"}
+        )
+
+    def is_owned_file(self, file_id: int, user_id: int) -> bool:
+        return self._repository.exists(
+            file_id=file_id, created_by_id=user_id, status=Upload.Status.COMPLETE
+        )
+
+    def purge_stale(self) -> int:
+        updated_before = timezone.now() - timedelta(
+            hours=settings.CHUNKED_UPLOAD_EXPIRE_HOURS
+        )
+        ids = self._repository.stale_ids(updated_before)
+        self._repository.filter(id__in=ids).delete()
+        for upload_id in ids:
+            self._remove_temp(upload_id)
+        return len(ids)
+
+    def _get_pending(self, upload_id: UUID, user_id: int) -> Upload:
+        upload = self._repository.lock(upload_id, user_id)
+        if upload is None:
+            raise NotFound("Upload not found")
+        if upload.status != Upload.Status.PENDING:
+            raise_validation_error_detail("Upload is already finalized")
+        return upload
+
+    def _sha256(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as part:
+            while data := part.read(self.copy_buffer_size):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def _remove_temp(self, upload_id: UUID) -> None:
+        try:
+            os.remove(self.temp_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+
+upload_service = UploadService()
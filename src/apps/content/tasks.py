@@ -0,0 +1,50 @@
+from celery import shared_task
+
+from src.apps.content.models.post import Post
+from src.apps.content.services.counters import post_likes_counter
+from src.apps.content.services.image import image_service
+from src.apps.content.services.post import post_service
+from src.apps.content.services.timeline import timeline_service
+from src.apps.content.services.upload import upload_service
+
+
+@shared_task
+def fan_out_post(post_id: int) -> None:
+    post = post_service.filter(id=post_id).values("created_at", "created_by_id").first()
+    if post is None:
+        return
+    tag_ids = Post.tags.through.objects.filter(post_id=post_id).values_list(
+        "tag_id", flat=True
+    )
+    timeline_service.push(
+        post_id=post_id,
+        created_at=post["created_at"],
+        author_id=post["created_by_id"],
+        tag_ids=list(tag_ids),
+    )
+
+
+@shared_task
+def rebuild_timeline(tag_id: int | None = None) -> None:
+    queryset = post_service.all()
+    if tag_id is not None:
+        queryset = queryset.filter(tags=tag_id)
+    entries = queryset.order_by("-created_at", "-id").values_list("id", "created_at")
+    timeline_service.rebuild(
+        timeline_service.key_for(tag_id), entries[: timeline_service.max_length]
+    )
+
+
+@shared_task
+def flush_post_like_counters() -> int:
+    return post_likes_counter.flush()
+
+
+@shared_task(ignore_result=True)
+def generate_image_variants(image_id: int) -> None:
+    image_service.generate_variants(image_id)
+
+
+@shared_task
+def purge_stale_uploads() -> int:
+    return upload_service.purge_stale()
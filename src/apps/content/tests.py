@@ -1 +1,468 @@
-# Create your tests here.
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import nullcontext
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image as PILImage
+from rest_framework.test import APIClient
+
+from src.apps.accounts.models import User
+from src.apps.content.models import Comment, File, Image, Like, Post, PostImage
+from src.apps.content.models.tag import Tag
+from src.apps.content.serializers import ImageSerializer, ListPostSerializer
+from src.apps.content.services.comment import comment_service
+from src.apps.content.services.counters import post_likes_counter
+from src.apps.content.services.file import file_service
+from src.apps.content.services.image import image_service
+from src.apps.content.services.like import like_service
+from src.apps.content.services.post import post_service
+from src.apps.content.services.tag import tag_service
+from src.apps.content.services.timeline import timeline_service
+
+
+class PostFeedQueryCountTest(TestCase):
+    LIST_URL = "/api/content/post/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        cls.tags = [Tag.objects.create(name=f"tag-{i}") for i in range(3)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create_posts(self, amount: int):
+        posts = []
+        for i in range(amount):
+            author = User.objects.create(
+                username=f"author-{Post.objects.count()}-{i}",
+                email=f"author-{Post.objects.count()}-{i}@test.com",
+            )
+            post = Post.objects.create(
+                title="title", content="content", created_by=author
+            )
+            post.tags.set(self.tags)
+            image = Image.objects.create(image=f"images/{post.id}.png")
+            PostImage.objects.create(post=post, image=image)
+            for j in range(5):
+                comment_service.create(
+                    post_id=post.id, content=f"c{j}", created_by=author
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                like_service.create(post_id=post.id, created_by=self.user)
+            posts.append(post)
+        return posts
+
+    def _count_queries(self, url: str):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        self._create_posts(2)
+        small, _ = self._count_queries(self.LIST_URL)
+
+        self._create_posts(8)
+        full, response = self._count_queries(self.LIST_URL)
+
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(small, full)
+        # COUNT(*), posts, images, tags, comments, liked by me
+        self.assertEqual(full, 6)
+
+    def test_list_payload(self):
+        self._create_posts(1)
+        _, response = self._count_queries(self.LIST_URL)
+
+        item = response.data["results"][0]
+        self.assertEqual(item["likes"], 1)
+        self.assertTrue(item["liked_by_me"])
+        self.assertEqual(item["comments_count"], 5)
+        self.assertEqual(len(item["comments"]), 3)
+        self.assertEqual(len(item["tags"]), 3)
+        self.assertEqual(len(item["images"]), 1)
+        self.assertIn("Accept", response["Vary"])
+
+    def test_serializes_without_request(self):
+        self._create_posts(1)
+
+        data = ListPostSerializer(post_service.feed(), many=True).data
+
+        self.assertFalse(data[0]["liked_by_me"])
+
+    def test_retrieve_query_count(self):
+        (post,) = self._create_posts(1)
+        queries, response = self._count_queries(f"{self.LIST_URL}{post.id}/")
+
+        self.assertEqual(response.data["id"], post.id)
+        # post, images, tags, comments, liked by me
+        self.assertEqual(queries, 5)
+
+
+class PostFeedKeysetPaginationTest(TestCase):
+    LIST_URL = "/api/content/post/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        cls.posts = [
+            Post.objects.create(title=f"p{i}", content="c", created_by=cls.user)
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_are_stable_while_new_posts_arrive(self):
+        first = self.client.get(self.LIST_URL, {"pagination": "cursor", "page_size": 2})
+        self.assertNotIn("count", first.data)
+        Post.objects.create(title="new", content="c", created_by=self.user)
+
+        seen = [item["id"] for item in first.data["results"]]
+        url = first.data["next"]
+        while url:
+            response = self.client.get(url)
+            seen += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(seen, [post.id for post in reversed(self.posts)])
+
+    def test_cursor_page_skips_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.LIST_URL, {"pagination": "cursor"})
+        # posts, images, tags, comments, liked by me
+        self.assertEqual(len(ctx.captured_queries), 5)
+        self.assertNotIn("search_vector", ctx.captured_queries[0]["sql"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.LIST_URL, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+        # well-formed cursor, values the fields reject
+        cursor = base64.urlsafe_b64encode(b'["nope",1]').decode()
+        response = self.client.get(self.LIST_URL, {"cursor": cursor})
+        self.assertEqual(response.status_code, 404)
+
+    def test_deleted_post_leaves_the_timeline(self):
+        timeline = [post.id for post in reversed(self.posts)]
+        deleted = self.posts[-1]
+
+        def remove(post_id, keys):
+            self.assertIn(timeline_service.GLOBAL_KEY, keys)
+            timeline.remove(post_id)
+
+        with (
+            mock.patch.object(
+                timeline_service, "read", lambda key, position, limit: timeline
+            ),
+            mock.patch.object(timeline_service, "remove", remove),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(f"{self.LIST_URL}{deleted.id}/")
+            self.assertEqual(response.status_code, 204)
+            response = self.client.get(self.LIST_URL, {"pagination": "cursor"})
+
+        self.assertNotIn(deleted.id, timeline)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [post.id for post in reversed(self.posts[:-1])],
+        )
+
+    def test_search_is_keyset_paginated_by_rank(self):
+        matching = [
+            Post.objects.create(title=f"needle {i}", content="c", created_by=self.user)
+            for i in range(3)
+        ]
+        response = self.client.get(self.LIST_URL, {"q": "needle", "page_size": 2})
+        seen = [item["id"] for item in response.data["results"]]
+        self.assertNotIn("count", response.data)
+        seen += [
+            item["id"]
+            for item in self.client.get(response.data["next"]).data["results"]
+        ]
+
+        self.assertEqual(sorted(seen), [post.id for post in matching])
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        cls.post = Post.objects.create(title="t", content="c", created_by=cls.user)
+
+    def test_like_and_comment_update_counters(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            like = like_service.create(post_id=self.post.id, created_by=self.user)
+        comment_service.create(post_id=self.post.id, content="c", created_by=self.user)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            like_service.delete(instance=like, post_id=self.post.id)
+        post_service.increment_counters(self.post.id, likes_count=-1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_double_like_counts_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(like_service.like(self.post.id, self.user.id))
+            self.assertFalse(like_service.like(self.post.id, self.user.id))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(like_service.unlike(self.post.id, self.user.id))
+            self.assertFalse(like_service.unlike(self.post.id, self.user.id))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        Like.objects.create(post=self.post, created_by=self.user)
+        Comment.objects.create(post=self.post, content="c", created_by=self.user)
+        Post.objects.filter(id=self.post.id).update(likes_count=7)
+
+        with mock.patch.object(
+            post_likes_counter, "flushed", return_value=nullcontext(0)
+        ):
+            call_command("reconcile_post_counters", stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 1))
+
+    def test_reconcile_command_aborts_without_flush(self):
+        Post.objects.filter(id=self.post.id).update(likes_count=7)
+
+        with self.assertRaises(CommandError):
+            call_command("reconcile_post_counters", stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 7)
+
+    def test_counter_batch_is_applied_once(self):
+        for _ in range(2):
+            post_likes_counter._apply_once(
+                "counters:test:flushing:x:0", {self.post.id: 2}
+            )
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+
+
+class TagResolutionTest(TestCase):
+    def setUp(self):
+        tag_service._repository._resolver.forget()
+
+    def test_resolves_list_with_two_queries_then_from_cache(self):
+        Tag.objects.create(name="existing")
+        names = ["existing"] + [f"new-{i}" for i in range(19)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                ids = tag_service.resolve_ids(names + [" new-0 ", ""])
+        self.assertEqual(len(ctx.captured_queries), 2)
+        by_name = dict(Tag.objects.values_list("name", "id"))
+        self.assertEqual(ids, [by_name[name] for name in names])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(tag_service.resolve_ids(reversed(names)), ids[::-1])
+
+
+class ImageVariantsTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _upload(self, size=(2000, 1000)):
+        buffer = BytesIO()
+        PILImage.new("RGB", size, "red").save(buffer, "JPEG")
+        return SimpleUploadedFile("photo.jpg", buffer.getvalue(), "image/jpeg")
+
+    def test_variants_are_rendered_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            image = image_service.create(image=self._upload())
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {})
+
+        for callback in callbacks:
+            callback()
+        image.refresh_from_db()
+
+        self.assertEqual(
+            set(image.variants), {"thumb", "thumb_webp", "medium", "medium_webp"}
+        )
+        self.assertEqual(
+            (image.variants["thumb"]["width"], image.variants["thumb"]["height"]),
+            (320, 160),
+        )
+        self.assertTrue(image.variants["medium_webp"]["path"].endswith(".webp"))
+
+    def test_serializer_returns_variant_or_original(self):
+        image = image_service.create(image=self._upload())
+        self.assertEqual(ImageSerializer(image).data["thumbnail"], image.image.url)
+
+        image_service.generate_variants(image.id)
+        image.refresh_from_db()
+        data = ImageSerializer(image).data
+
+        self.assertEqual(
+            data["thumbnail"], image.image.storage.url(image.variants["thumb"]["path"])
+        )
+        self.assertIn("/images/variants/", data["medium"])
+        self.assertEqual(data["image"], image.image.url)
+
+    def test_post_images_are_ingested_in_constant_queries(self):
+        user = User.objects.create(username="poster", email="poster@test.com")
+        post = Post.objects.create(title="t", content="c", created_by=user)
+        uploads = [self._upload(size=(10 + i, 10)) for i in range(10)]
+        uploads.append(self._upload(size=(10, 10)))
+
+        # existing digests, INSERT images, INSERT links
+        with self.assertNumQueries(3):
+            post_service._set_images(instance=post, images=uploads)
+
+        self.assertEqual(post.images.count(), 10)
+        self.assertEqual(Image.objects.count(), 10)
+
+    def test_identical_uploads_share_row_and_file(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            first = image_service.create(image=self._upload())
+            second = image_service.create(image=self._upload())
+        other = image_service.create(image=self._upload(size=(10, 10)))
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotEqual(first.id, other.id)
+        self.assertTrue(first.image.name.startswith(f"images/{first.digest[:2]}/"))
+        self.assertTrue(first.image.storage.exists(first.image.name))
+
+    def test_identical_files_share_blob_but_not_row(self):
+        payload = b"%PDF-1.4 paper"
+        first = file_service.create(
+            title="first", file=SimpleUploadedFile("paper.pdf", payload)
+        )
+        second = file_service.create(
+            title="second", file=SimpleUploadedFile("paper.PDF.bin", payload)
+        )
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual((first.title, second.title), ("first", "second"))
+        shard = os.path.dirname(first.file.path)
+        self.assertEqual(os.listdir(shard), [os.path.basename(first.file.name)])
+
+
+class ChunkedUploadTest(TestCase):
+    URL = "/api/content/upload/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="uploader", email="up@test.com")
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        settings_override = override_settings(
+            MEDIA_ROOT=tmp,
+            CHUNKED_UPLOAD_DIR=f"{tmp}/uploads",
+            CHUNKED_UPLOAD_CHUNK_SIZE=4,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _start(self, payload: bytes, checksum: bytes = None):
+        response = self.client.post(
+            self.URL,
+            {
+                "title": "paper",
+                "filename": "paper.pdf",
+                "size": len(payload),
+                "checksum": hashlib.sha256(checksum or payload).hexdigest(),
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def _put(self, upload_id, offset: int, data: bytes):
+        return self.client.put(
+            f"{self.URL}{upload_id}/chunk/?offset={offset}",
+            data,
+            content_type="application/octet-stream",
+        )
+
+    def test_resumed_upload_becomes_file(self):
+        upload_id = self._start(b"0123456789")
+        self.assertEqual(self._put(upload_id, 0, b"0123").data["offset"], 4)
+
+        stale = self._put(upload_id, 0, b"0123")
+        self.assertEqual(stale.status_code, 400)
+        self.assertEqual(self.client.get(f"{self.URL}{upload_id}/").data["offset"], 4)
+        self.assertEqual(self._put(upload_id, 4, b"45678").status_code, 400)
+
+        self._put(upload_id, 4, b"4567")
+        self._put(upload_id, 8, b"89")
+        response = self.client.post(f"{self.URL}{upload_id}/finalize/")
+
+        self.assertEqual(response.data["status"], "complete")
+        file = File.objects.get(id=response.data["file_id"])
+        with file.file.open("rb") as stored:
+            self.assertEqual(stored.read(), b"0123456789")
+
+    def test_checksum_mismatch_restarts_upload(self):
+        upload_id = self._start(b"abc", checksum=b"other")
+        self._put(upload_id, 0, b"abc")
+
+        response = self.client.post(f"{self.URL}{upload_id}/finalize/")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"{self.URL}{upload_id}/").data["offset"], 0)
+
+
+class MediaDeliveryTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_DELIVERY="x-accel"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_hashed_path_is_immutable_and_sent_by_nginx(self):
+        stored = file_service.create(
+            title="t", file=SimpleUploadedFile("a.pdf", b"pdf bytes")
+        ).file.name
+
+        response = self.client.get(f"/media/{stored}")
+
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{stored}")
+        self.assertEqual(response.content, b"")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(
+            self.client.get(
+                f"/media/{stored}", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            304,
+        )
+
+    def test_hidden_and_missing_paths(self):
+        self.assertEqual(self.client.get("/media/.incoming/tmpfile").status_code, 404)
+        self.assertEqual(self.client.get("/media/images/missing.png").status_code, 404)
@@ -1,12 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from src.apps.content.views import CommentAPIView, LikeAPIView, PostAPIView
+from src.apps.content.views import (
+    CommentAPIView,
+    LikeAPIView,
+    PostAPIView,
+    UploadAPIView,
+)
 
 router = DefaultRouter()
 
 router.register("post", PostAPIView, basename="posts")
 router.register("like", LikeAPIView, basename="likes")
 router.register("comment", CommentAPIView, basename="comments")
+router.register("upload", UploadAPIView, basename="uploads")
 
 urlpatterns = [path("", include(router.urls))]
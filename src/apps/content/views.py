@@ -1,3 +1,5 @@
+from io import BytesIO
+
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
@@ -9,10 +11,12 @@ from src.apps.content.serializers import (
     LikeSerializer,
     ListPostSerializer,
     PostSerializer,
+    UploadSerializer,
 )
 from src.apps.content.services.post import post_service
 from src.apps.content.services.comment import comment_service
 from src.apps.content.services.like import like_service
+from src.apps.content.services.upload import upload_service
 from src.utils.conts import ViewAction
 from rest_framework.response import Response
 from rest_framework import status
@@ -21,14 +25,37 @@ from src.utils.functions import raise_validation_error_detail
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from src.utils.images import VaryOnAcceptMixin
+from src.utils.pagination import KeysetPagination, RankKeysetPagination
 
 
 @extend_schema(tags=["content"])
-class PostAPIView(ModelViewSet):
+class PostAPIView(VaryOnAcceptMixin, ModelViewSet):
     permission_classes = (IsAuthenticated,)
     filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
-    filterset_fields = ("created_by",)
+    filterset_fields = ("created_by", "tags")
     model = Post
+    timeline_query_params = {"cursor", "pagination", "page_size", "tags"}
+    search_query_param = "q"
+
+    @property
+    def paginator(self):
+        """
+        `?pagination=cursor` (or any `?cursor=`) switches the list to keyset
+        pagination on (created_at, id); page number pagination stays the default.
+        `?q=` search results are always keyset paginated on (rank, id).
+        """
+        if not hasattr(self, "_paginator"):
+            if self._search_text():
+                self._paginator = RankKeysetPagination()
+            elif KeysetPagination.is_requested(self.request):
+                self._paginator = KeysetPagination()
+        return super().paginator
+
+    def _search_text(self) -> str:
+        if self.action != ViewAction.LIST:
+            return ""
+        return self.request.query_params.get(self.search_query_param, "").strip()
 
     def get_serializer_class(self):
         if self.action in [
@@ -40,15 +67,52 @@ class PostAPIView(ModelViewSet):
         return ListPostSerializer
 
     def get_queryset(self):
-        return post_service.all().order_by("-created_by")
+        text = self._search_text()
+        if text:
+            return post_service.search(text).order_by("-rank", "-id")
+        return post_service.feed().order_by("-created_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        page = self._timeline_page()
+        if page is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(page, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
+
+    def _timeline_page(self):
+        """
+        Plain and per-tag cursor feeds are served from the Redis timeline:
+        ids for the page, then one batched hydration query.
+        """
+        paginator = self.paginator
+        params = self.request.query_params
+        if type(paginator) is not KeysetPagination:
+            return None
+        if set(params) - self.timeline_query_params:
+            return None
+        try:
+            tag_id = int(params["tags"]) if "tags" in params else None
+        except ValueError:
+            return None
+
+        paginator.request = self.request
+        paginator.page_size = paginator.get_page_size(self.request)
+        position = paginator.decode_cursor(self.request, self.get_queryset())
+        ids = post_service.timeline_ids(position, paginator.page_size + 1, tag_id)
+        if ids is None:
+            return None
+
+        paginator.paginate_objects(ids)
+        paginator.page = post_service.feed_by_ids(paginator.page)
+        return paginator.page
 
     def destroy(self, request, *args, **kwargs):
-        instance = self.model.objects.filter(
-            id=kwargs.get("id"), created_by_id=request.user.id
-        )
+        instance = post_service.filter(
+            id=kwargs.get(self.lookup_field), created_by_id=request.user.id
+        ).first()
         if not instance:
             raise_validation_error_detail({"data": "Not found"})
-        self.perform_destroy(instance)
+        post_service.delete(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -60,7 +124,6 @@ class LikeAPIView(GenericViewSet):
 
     def get_queryset(self):
         return like_service.filter(created_by_id=self.request.user.id)
-    
 
     serializer_class = LikeSerializer
 
@@ -69,15 +132,11 @@ class LikeAPIView(GenericViewSet):
         """
         Custom action to add a like by post_id instead of like_id.
         """
-        post_id = request.query_params.get("post_id")
-        if not post_id:
+        post_id = request.query_params.get("post_id", "")
+        if not post_id.isdigit():
             raise_validation_error_detail("post_id is required")
 
-        like = like_service.exists(post_id=post_id, created_by_id=request.user.id)
-        if like:
-            raise_validation_error_detail("You have liked this post")
-
-        like_service.create(post_id=post_id, created_by_id=request.user.id)
+        like_service.like(int(post_id), request.user.id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=False, methods=["delete"], url_path="remove")
@@ -85,17 +144,11 @@ class LikeAPIView(GenericViewSet):
         """
         Custom action to delete a like by post_id instead of like_id.
         """
-        post_id = request.query_params.get("post_id")
-        if not post_id:
+        post_id = request.query_params.get("post_id", "")
+        if not post_id.isdigit():
             raise_validation_error_detail("post_id is required")
 
-        like = like_service.filter(
-            post_id=post_id, created_by_id=request.user.id
-        ).first()
-        if not like:
-            raise_validation_error_detail("You haven't liked this post")
-
-        like_service.delete(instance=like, post_id=post_id)
+        like_service.unlike(int(post_id), request.user.id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -121,3 +174,51 @@ class CommentAPIView(GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(tags=["content"])
+class UploadAPIView(GenericViewSet):
+    """
+    Resumable upload of large files: `POST /upload/` with the expected size
+    and SHA-256, `PUT /upload/{id}/chunk/?offset=N` with raw bytes, resumed
+    from `offset` of `GET /upload/{id}/`, then `POST /upload/{id}/finalize/`
+    which returns the `file_id` to reference from an article.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = UploadSerializer
+    lookup_field = "id"
+    lookup_value_regex = "[0-9a-f-]{36}"
+
+    def get_queryset(self):
+        return upload_service.filter(created_by_id=self.request.user.id)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    @extend_schema(
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+        parameters=[OpenApiParameter("offset", int, required=True)],
+    )
+    @action(detail=True, methods=["put"], url_path="chunk")
+    def chunk(self, request, id=None):
+        try:
+            offset = int(request.query_params["offset"])
+        except (KeyError, ValueError):
+            raise_validation_error_detail({"offset": "Integer offset is required"})
+        upload = upload_service.write_chunk(
+            id, request.user.id, offset, request.stream or BytesIO()
+        )
+        return Response(self.get_serializer(upload).data)
+
+    @extend_schema(request=None)
+    @action(detail=True, methods=["post"], url_path="finalize")
+    def finalize(self, request, id=None):
+        upload = upload_service.finalize(id, request.user.id)
+        return Response(self.get_serializer(upload).data)
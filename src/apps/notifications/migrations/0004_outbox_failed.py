@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_outbox_event"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxevent",
+            name="error",
+            field=models.TextField(blank=True, default="", verbose_name="Ошибка"),
+        ),
+        migrations.AddField(
+            model_name="outboxevent",
+            name="failed_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Время ошибки"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outboxevent",
+            index=models.Index(
+                condition=models.Q(("failed_at__isnull", True)),
+                fields=["id"],
+                name="idx_outbox_pending",
+            ),
+        ),
+    ]
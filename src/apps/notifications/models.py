@@ -8,3 +8,26 @@ class Notification(AbstractAuditableModel, AbstractTimestampsModel):
     content = models.SlugField(max_length=100)
     type = models.SmallIntegerField()
     is_read = models.BooleanField(default=False, db_default=False)
+
+
+class OutboxEvent(models.Model):
+    """
+    Side effect recorded in the transaction that caused it and relayed later
+    (see OutboxRelay), so it is neither lost on a crash nor run under locks.
+    Events the relay cannot deliver are kept with `failed_at` set.
+    """
+
+    created_at = models.DateTimeField(verbose_name="Время создания", auto_now_add=True)
+    topic = models.CharField(verbose_name="Тема", max_length=64)
+    payload = models.JSONField(verbose_name="Данные")
+    failed_at = models.DateTimeField(verbose_name="Время ошибки", blank=True, null=True)
+    error = models.TextField(verbose_name="Ошибка", blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="idx_outbox_pending",
+            ),
+        ]
@@ -0,0 +1,40 @@
+import pika
+
+from src.utils.bases.publisher import AbstractPublisher
+
+
+class NotificationPublisher(AbstractPublisher):
+    """Durable fanout exchange mirroring the notifications pushed to websockets."""
+
+    def __init__(self, host: str, exchange: str = "notifications"):
+        super().__init__(host)
+        self.exchange = exchange
+        self.queue = exchange
+
+    def open(self) -> "NotificationPublisher":
+        self.connect()
+        self.declare_exchange()
+        self.declare_queue()
+        self.declare_bind()
+        return self
+
+    def declare_exchange(self):
+        self.channel.exchange_declare(
+            exchange=self.exchange, exchange_type="fanout", durable=True
+        )
+
+    def declare_queue(self):
+        self.channel.queue_declare(queue=self.queue, durable=True)
+
+    def declare_bind(self):
+        self.channel.queue_bind(exchange=self.exchange, queue=self.queue)
+
+    def publish_message(self, message: str):
+        self.channel.basic_publish(
+            exchange=self.exchange,
+            routing_key="",
+            body=message,
+            properties=pika.BasicProperties(
+                content_type="application/json", delivery_mode=2
+            ),
+        )
@@ -1,38 +1,185 @@
-from typing import Iterable
-from channels.layers import get_channel_layer
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, transaction
+from django.utils import timezone
+
 from src.apps.accounts.models import User
-from src.apps.notifications.models import Notification
+from src.apps.content.models.post import Post
+from src.apps.notifications.models import Notification, OutboxEvent
+from src.apps.notifications.publishers import NotificationPublisher
 from src.apps.notifications.serializers import NotificationSerializer
-from src.utils.bases.services import AbstractEditService
-from src.utils.conts import NotifcationType
+from src.utils.conts import NotifcationType, OutboxTopic
+
+logger = logging.getLogger(__name__)
+
+
+def get_serializer_for_notification(notification):
+    serializer = NotificationSerializer(notification)
+    return serializer.data
+
+
+def enqueue_event(topic: OutboxTopic, **payload) -> OutboxEvent:
+    """
+    Records a side effect in the caller's transaction; the relay is kicked
+    once it commits (celery beat drains anything a lost kick left behind).
+    """
+    from src.apps.notifications.tasks import relay_outbox
 
+    event = OutboxEvent.objects.create(topic=topic, payload=payload)
+    transaction.on_commit(relay_outbox.delay)
+    return event
 
-class PostLikeNotify:
-    def __init__(self, post_owner, liked_user_name):
-        self.post_owner = post_owner
-        self.liked_username = liked_user_name
 
-    def notify(self):
-        msg = f"{self.liked_username} liked your post"
-        notification = create_notification(
-            user_id=self.post_owner.id, content=msg, type=NotifcationType.POST_LIKED
+class OutboxRelay:
+    """
+    Drains pending `OutboxEvent` rows in id order, `batch_size` per
+    transaction: notification rows are bulk-inserted and the events deleted
+    together, rows being locked with SKIP LOCKED so several relays can run at
+    once. Pushes to the channel layer (and to RabbitMQ when
+    OUTBOX_RABBITMQ_HOST is set) go out on commit, so a rolled back batch
+    never reaches a client; they are at-most-once, the rows are exact.
+
+    When a batch fails for anything but a lost connection, its events are
+    retried one per transaction and those that still fail are marked with
+    `failed_at`/`error` and left out of later batches.
+    """
+
+    messages = {
+        OutboxTopic.POST_LIKED: ("{actor} liked your post", NotifcationType.POST_LIKED),
+        OutboxTopic.POST_COMMENTED: (
+            "{actor} commented your post",
+            NotifcationType.POST_COMMENTED,
+        ),
+    }
+    transient_errors = (OperationalError, InterfaceError)
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        rabbitmq_host: Optional[str] = None,
+    ):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.rabbitmq_host = rabbitmq_host or settings.OUTBOX_RABBITMQ_HOST
+
+    def drain(self, max_batches: int = 100) -> int:
+        relayed = 0
+        for _ in range(max_batches):
+            count = self.relay_batch()
+            relayed += count
+            if count < self.batch_size:
+                break
+        return relayed
+
+    def relay_batch(self) -> int:
+        try:
+            return self._relay(self.batch_size)
+        except self.transient_errors:
+            raise
+        except Exception:
+            logger.exception("Outbox batch failed, relaying its events one by one")
+        ids = list(
+            OutboxEvent.objects.filter(failed_at__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)[: self.batch_size]
         )
-        send_notification(username=self.post_owner.username, notification=notification)
+        for event_id in ids:
+            try:
+                self._relay(1, id=event_id)
+            except self.transient_errors:
+                raise
+            except Exception as exc:
+                logger.exception("Outbox event %s failed", event_id)
+                OutboxEvent.objects.filter(id=event_id).update(
+                    failed_at=timezone.now(), error=repr(exc)
+                )
+        return len(ids)
+
+    def _relay(self, limit: int, **filters) -> int:
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(failed_at__isnull=True, **filters)
+                .order_by("id")[:limit]
+            )
+            if not events:
+                return 0
+            notifications = Notification.objects.bulk_create(
+                self._notifications(events)
+            )
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).delete()
+            transaction.on_commit(partial(self._publish, notifications), robust=True)
+        return len(events)
 
+    def _notifications(self, events: Iterable[OutboxEvent]) -> List[Notification]:
+        posts = (
+            Post.objects.select_related("created_by")
+            .only("id", "created_by__username")
+            .in_bulk({event.payload.get("post_id") for event in events})
+        )
+        actors = User.objects.only("id", "username").in_bulk(
+            {event.payload.get("actor_id") for event in events}
+        )
+        max_length = Notification._meta.get_field("content").max_length
 
-def create_notification(user_id, **kwargs):
-    return Notification.objects.create(user_id=user_id, **kwargs)
+        notifications = []
+        for event in events:
+            post = posts.get(event.payload.get("post_id"))
+            actor = actors.get(event.payload.get("actor_id"))
+            if (
+                post is None
+                or post.created_by is None
+                or actor is None
+                or event.topic not in self.messages
+            ):
+                continue
+            template, type_ = self.messages[event.topic]
+            # Usernames are longer than the whole notification may be.
+            name_length = max_length - len(template.format(actor=""))
+            notifications.append(
+                Notification(
+                    user=post.created_by,
+                    created_by=actor,
+                    content=template.format(actor=actor.username[:name_length]),
+                    type=type_,
+                )
+            )
+        return notifications
 
+    def _publish(self, notifications: List[Notification]) -> None:
+        messages = [
+            (n.user.username, get_serializer_for_notification(n)) for n in notifications
+        ]
+        if not messages:
+            return
+        async_to_sync(self._group_send)(messages)
+        if self.rabbitmq_host:
+            publisher = NotificationPublisher(self.rabbitmq_host).open()
+            try:
+                for username, data in messages:
+                    publisher.publish_message(
+                        json.dumps({"username": username, **data}, default=str)
+                    )
+            finally:
+                publisher.close()
 
-def get_serializer_for_notification(notification):
-    serializer = NotificationSerializer(notification)
-    return serializer.data
+    @staticmethod
+    async def _group_send(messages: List[Tuple[str, Dict]]) -> None:
+        channel_layer = get_channel_layer()
+        await asyncio.gather(
+            *(
+                channel_layer.group_send(
+                    group, {"type": "send_notification", "data": data}
+                )
+                for group, data in messages
+            )
+        )
 
 
-def send_notification(username, notification):
-    channel_layer = get_channel_layer()
-    serializered_data = get_serializer_for_notification(notification=notification)
-    async_to_sync(channel_layer.group_send)(
-        username, {"type": "send_notification", "data": serializered_data}
-    )
+outbox_relay = OutboxRelay()
@@ -1,3 +1,72 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.test import TestCase
 
-# Create your tests here.
+from src.apps.accounts.models import User
+from src.apps.content.models import Post
+from src.apps.content.services.like import like_service
+from src.apps.notifications.models import Notification, OutboxEvent
+from src.apps.notifications.services import OutboxRelay
+from src.utils.conts import OutboxTopic
+
+
+class OutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username="owner", email="owner@test.com")
+        cls.fan = User.objects.create(username="fan", email="fan@test.com")
+        cls.post = Post.objects.create(title="t", content="c", created_by=cls.owner)
+
+    def test_like_writes_event_and_relay_delivers_it(self):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(self.owner.username, channel)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            like_service.create(post_id=self.post.id, created_by=self.fan)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(callbacks), 2)
+
+        # savepoint, events, posts, actors, insert notifications, delete events,
+        # release savepoint; the push waits for commit
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(7):
+            OutboxRelay(batch_size=10).relay_batch()
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.owner)
+        self.assertEqual(notification.content, "fan liked your post")
+        self.assertFalse(OutboxEvent.objects.exists())
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message["data"]["id"], notification.id)
+
+    def test_failing_event_is_set_aside(self):
+        poison = OutboxEvent.objects.create(
+            topic=OutboxTopic.POST_LIKED, payload={"post_id": "x", "actor_id": 1}
+        )
+        OutboxEvent.objects.create(
+            topic=OutboxTopic.POST_LIKED,
+            payload={"post_id": self.post.id, "actor_id": self.fan.id},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(OutboxRelay(batch_size=10).drain(), 2)
+
+        self.assertEqual(Notification.objects.count(), 1)
+        poison.refresh_from_db()
+        self.assertIsNotNone(poison.failed_at)
+        self.assertTrue(poison.error)
+        self.assertEqual(list(OutboxEvent.objects.all()), [poison])
+        self.assertEqual(OutboxRelay(batch_size=10).drain(), 0)
+
+    def test_long_username_is_truncated(self):
+        fan = User.objects.create(username="f" * 150, email="long@test.com")
+        like_service.create(post_id=self.post.id, created_by=fan)
+
+        OutboxRelay(batch_size=10).relay_batch()
+
+        content = Notification.objects.get().content
+        self.assertEqual(len(content), 100)
+        self.assertTrue(content.endswith(" liked your post"))
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    config = settings.POSTGRES_SEARCH_CONFIG
+    schema_editor.execute(
+        """
+        UPDATE scientific_article_scientificarticle AS a SET search_vector =
+            setweight(to_tsvector(%s::regconfig, coalesce(a.title, '')), 'A')
+            || setweight(to_tsvector(%s::regconfig, coalesce((
+                SELECT string_agg(au.name, ' ')
+                FROM scientific_article_author AS au
+                JOIN scientific_article_scientificarticleauthors AS sa
+                    ON sa.author_id = au.id
+                WHERE sa.scientific_article_id = a.id
+            ), '')), 'B')
+            || setweight(to_tsvector(%s::regconfig, coalesce((
+                SELECT string_agg(t.name, ' ')
+                FROM content_tag AS t
+                JOIN scientific_article_scientificarticletags AS st
+                    ON st.tag_id = t.id
+                WHERE st.scientific_article_id = a.id
+            ), '')), 'B')
+            || setweight(to_tsvector(%s::regconfig, coalesce(a.content, '')), 'C')
+        """,
+        [config] * 4,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0007_post_search_vector"),
+        ("scientific_article", "0002_author_scientificarticleauthors_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scientificarticle",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scientificarticle",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="idx_scient_article_search"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def dedupe_likes(apps, schema_editor):
+    """Keeps the oldest like of every (article, user) pair and recounts."""
+    Like = apps.get_model("scientific_article", "ScientificArticleLike")
+    Article = apps.get_model("scientific_article", "ScientificArticle")
+
+    duplicates = (
+        Like.objects.order_by()
+        .values("scientific_article_id", "created_by_id")
+        .annotate(first_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    article_ids = set()
+    for row in duplicates.iterator():
+        Like.objects.filter(
+            scientific_article_id=row["scientific_article_id"],
+            created_by_id=row["created_by_id"],
+        ).exclude(id=row["first_id"]).delete()
+        article_ids.add(row["scientific_article_id"])
+
+    if article_ids:
+        likes = (
+            Like.objects.filter(scientific_article_id=OuterRef("pk"))
+            .order_by()
+            .values("scientific_article_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        Article.objects.filter(id__in=article_ids).update(
+            likes_count=Coalesce(Subquery(likes, output_field=IntegerField()), 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scientific_article", "0003_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_likes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="scientificarticlelike",
+            name="scientific__scienti_f0d1d7_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="scientificarticlelike",
+            constraint=models.UniqueConstraint(
+                fields=("scientific_article", "created_by"), name="uq_article_like_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:49
+
+import math
+import re
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+STATS_FIELDS = ["content_preview", "word_count", "reading_time"]
+
+# frozen copy of src.utils.text.content_stats as of this migration
+PREVIEW_LENGTH = 160
+WORDS_PER_MINUTE = 200
+WORD_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+
+
+def content_stats(text):
+    text = text or ""
+    word_count = sum(1 for _ in WORD_RE.finditer(text))
+    return (
+        Truncator(text).chars(PREVIEW_LENGTH),
+        word_count,
+        math.ceil(word_count / WORDS_PER_MINUTE),
+    )
+
+
+def backfill_content_stats(apps, schema_editor):
+    Article = apps.get_model("scientific_article", "ScientificArticle")
+    batch = []
+    for article in Article.objects.only("id", "content").iterator(BATCH_SIZE):
+        (
+            article.content_preview,
+            article.word_count,
+            article.reading_time,
+        ) = content_stats(article.content)
+        batch.append(article)
+        if len(batch) == BATCH_SIZE:
+            Article.objects.bulk_update(batch, STATS_FIELDS)
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, STATS_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scientific_article", "0004_article_like_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scientificarticle",
+            name="content_preview",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=160
+            ),
+        ),
+        migrations.AddField(
+            model_name="scientificarticle",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Время чтения, мин"
+            ),
+        ),
+        migrations.AddField(
+            model_name="scientificarticle",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_content_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import Index
 
 from src.utils.bases.models import AbstractAuditableModel, AbstractTimestampsModel
+from src.utils.conts import CONTENT_PREVIEW_LENGTH
+from src.utils.text import content_stats
 
 
 class Author(AbstractAuditableModel, AbstractTimestampsModel):
@@ -14,6 +18,14 @@ class Author(AbstractAuditableModel, AbstractTimestampsModel):
 class ScientificArticle(AbstractAuditableModel, AbstractTimestampsModel):
     title = models.CharField(max_length=255, db_index=True)
     content = models.TextField()
+    # derived from `content` on save, so lists never load the full body
+    content_preview = models.CharField(
+        max_length=CONTENT_PREVIEW_LENGTH, blank=True, default="", editable=False
+    )
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(
+        verbose_name="Время чтения, мин", default=0, editable=False
+    )
 
     file = models.ForeignKey(
         "content.File",
@@ -33,13 +45,35 @@ class ScientificArticle(AbstractAuditableModel, AbstractTimestampsModel):
     )
     likes_count = models.PositiveIntegerField(default=0)
     comments_count = models.PositiveIntegerField(default=0)
+    # weighted title/tags/authors/content, maintained by ScientificArticleService
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             Index(fields=["created_at"], name="idx_scient_article_created_at"),
+            GinIndex(fields=["search_vector"], name="idx_scient_article_search"),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.set_content_stats()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "content_preview",
+                    "word_count",
+                    "reading_time",
+                }
+        super().save(*args, **kwargs)
+
+    def set_content_stats(self) -> None:
+        stats = content_stats(self.content)
+        self.content_preview = stats.preview
+        self.word_count = stats.word_count
+        self.reading_time = stats.reading_time
+
 
 class ScientificArticleAuthors(AbstractAuditableModel):
     author = models.ForeignKey(
@@ -108,7 +142,12 @@ class ScientificArticleLike(AbstractAuditableModel, AbstractTimestampsModel):
     updated_by = None
 
     class Meta:
-        indexes = [Index(fields=["scientific_article"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scientific_article", "created_by"],
+                name="uq_article_like_user",
+            ),
+        ]
 
 
 class ScientificArticleComments(AbstractAuditableModel, AbstractTimestampsModel):
@@ -0,0 +1,297 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    FloatField,
+    IntegerField,
+    JSONField,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, Greatest, Substr
+
+from src.apps.scientific_article.models import (
+    ScientificArticle,
+    ScientificArticleLike,
+    ScientificArticleTags,
+)
+from src.apps.scientific_article.models.scientific_article import (
+    Author,
+    ScientificArticleAuthors,
+    ScientificArticleComments,
+)
+from src.utils.bases.repositories import AbstractRepository
+from src.utils.resolvers import BulkNameResolver
+from src.utils.conts import ARTICLE_COMMENTS_LIMIT, SEARCH_SNIPPET_LENGTH
+
+
+def _names_of(through, name_field: str) -> Subquery:
+    return Subquery(
+        through.objects.filter(scientific_article=OuterRef("pk"))
+        .order_by()
+        .values("scientific_article")
+        .annotate(names=StringAgg(name_field, " "))
+        .values("names")
+    )
+
+
+def _count_by_article(model) -> Coalesce:
+    subquery = (
+        model.objects.filter(scientific_article_id=OuterRef("pk"))
+        .order_by()
+        .values("scientific_article_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+def _article_search_vector() -> SearchVector:
+    config = settings.POSTGRES_SEARCH_CONFIG
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector(
+            _names_of(ScientificArticleAuthors, "author__name"),
+            weight="B",
+            config=config,
+        )
+        + SearchVector(
+            _names_of(ScientificArticleTags, "tag__name"), weight="B", config=config
+        )
+        + SearchVector("content", weight="C", config=config)
+    )
+
+
+class ScientificArticleRepository(AbstractRepository[ScientificArticle]):
+    model = ScientificArticle
+
+    def detail(
+        self, comments_limit: int = ARTICLE_COMMENTS_LIMIT
+    ) -> QuerySet[ScientificArticle]:
+        """
+        Queryset for the detail page: authors and only the latest
+        `comments_limit` comments (one windowed query for all of them, with
+        their authors joined) are prefetched.
+        """
+        return self.all().prefetch_related(
+            "authors",
+            Prefetch(
+                "comments",
+                queryset=self.comments()[:comments_limit],
+                to_attr="latest_comments",
+            ),
+        )
+
+    @staticmethod
+    def comments(article_id: Optional[int] = None) -> QuerySet:
+        queryset = ScientificArticleComments.objects.select_related(
+            "created_by"
+        ).order_by("-created_at", "-id")
+        if article_id is not None:
+            queryset = queryset.filter(scientific_article_id=article_id)
+        return queryset
+
+    def search(
+        self, text: str, tags: Sequence[str] = (), authors: Sequence[str] = ()
+    ) -> QuerySet[ScientificArticle]:
+        """
+        Articles matching `text` (and every given tag / author name), annotated
+        with `rank` and a short `snippet`. `content` is left in the database.
+        """
+        queryset = (
+            self.all()
+            .defer("content", "search_vector")
+            .prefetch_related("tags", "authors")
+        )
+        for name in tags:
+            queryset = queryset.filter(
+                Exists(
+                    ScientificArticleTags.objects.filter(
+                        scientific_article=OuterRef("pk"), tag__name=name
+                    )
+                )
+            )
+        for name in authors:
+            queryset = queryset.filter(
+                Exists(
+                    ScientificArticleAuthors.objects.filter(
+                        scientific_article=OuterRef("pk"), author__name=name
+                    )
+                )
+            )
+
+        if connection.vendor != "postgresql":
+            return queryset.filter(
+                Q(title__icontains=text) | Q(content__icontains=text)
+            ).annotate(
+                rank=Value(0.0, FloatField()),
+                snippet=Substr("content", 1, SEARCH_SNIPPET_LENGTH),
+            )
+
+        config = settings.POSTGRES_SEARCH_CONFIG
+        query = SearchQuery(text, search_type="websearch", config=config)
+        return queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+            snippet=SearchHeadline(
+                "content", query, config=config, max_words=35, min_words=15
+            ),
+        )
+
+    def with_facets(
+        self, queryset: QuerySet[ScientificArticle], limit: int
+    ) -> QuerySet[ScientificArticle]:
+        """
+        On PostgreSQL every row of `queryset` also carries `facet_rows`, the
+        facet counts of the whole match set as a jsonb list of [kind, name,
+        count]: the subquery is uncorrelated, so it runs once and a page and
+        its facets come back in one round trip. Other backends leave the
+        queryset as is and `facets()` runs separately.
+        """
+        if connection.vendor != "postgresql":
+            return queryset
+        sql, params = self._facet_union(queryset, limit).query.sql_with_params()
+        return queryset.annotate(
+            facet_rows=RawSQL(
+                "SELECT COALESCE(jsonb_agg(jsonb_build_array(f.kind, f.name, "
+                f"f.count)), '[]'::jsonb) FROM ({sql}) AS f",
+                params,
+                output_field=JSONField(),
+            )
+        )
+
+    def facets(
+        self, queryset: QuerySet[ScientificArticle], limit: int
+    ) -> Dict[str, List[dict]]:
+        """
+        Tag and author counts over every article of `queryset`, computed by a
+        single UNION ALL query.
+        """
+        return self.group_facets(self._facet_union(queryset, limit), limit)
+
+    @staticmethod
+    def group_facets(rows: Iterable[Sequence], limit: int) -> Dict[str, List[dict]]:
+        result = {"tags": [], "authors": []}
+        for kind, name, count in rows:
+            result[kind].append({"name": name, "count": count})
+        for kind, values in result.items():
+            values.sort(key=lambda item: (-item["count"], item["name"]))
+            result[kind] = values[:limit]
+        return result
+
+    def _facet_union(self, queryset: QuerySet[ScientificArticle], limit: int):
+        ids = queryset.order_by().values("id")
+        parts = [
+            self._facet(ScientificArticleTags, "tags", "tag__name", ids),
+            self._facet(ScientificArticleAuthors, "authors", "author__name", ids),
+        ]
+        if connection.features.supports_slicing_ordering_in_compound:
+            parts = [part.order_by("-count", "name")[:limit] for part in parts]
+        return parts[0].union(parts[1], all=True)
+
+    @staticmethod
+    def _facet(through, kind: str, name_field: str, ids: QuerySet) -> QuerySet:
+        return (
+            through.objects.filter(scientific_article__in=ids)
+            .order_by()
+            .values(kind=Value(kind), name=F(name_field))
+            .annotate(count=Count("scientific_article", distinct=True))
+            .values_list("kind", "name", "count")
+        )
+
+    def refresh_search_vector(self, article_ids: Iterable[int]) -> int:
+        if connection.vendor != "postgresql":
+            return 0
+        return self.filter(id__in=list(article_ids)).update(
+            search_vector=_article_search_vector()
+        )
+
+    def increment_counters(self, article_id: int, **deltas: int) -> int:
+        """
+        Atomic `counter = counter + delta` in a single UPDATE, clamped at zero.
+        """
+        return self.filter(id=article_id).update(
+            **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+        )
+
+    def reconcile_counters(self, id_from: int, id_to: int) -> int:
+        """
+        Recomputes likes_count / comments_count for articles with id in
+        [id_from, id_to) in one grouped UPDATE and rewrites only drifted rows.
+        """
+        likes = _count_by_article(ScientificArticleLike)
+        comments = _count_by_article(ScientificArticleComments)
+        drifted = (
+            self.filter(id__gte=id_from, id__lt=id_to)
+            .annotate(actual_likes=likes, actual_comments=comments)
+            .filter(
+                ~Q(likes_count=F("actual_likes"))
+                | ~Q(comments_count=F("actual_comments"))
+            )
+            .values("id")
+        )
+        return self.filter(id__in=drifted).update(
+            likes_count=likes, comments_count=comments
+        )
+
+
+class AuthorRepository(AbstractRepository[Author]):
+    model = Author
+
+    def __init__(self):
+        self._resolver = BulkNameResolver(self.model, "name")
+
+    def resolve_ids(
+        self, names: Iterable[str], created_by_id: Optional[int] = None
+    ) -> List[int]:
+        return self._resolver.resolve_ids(
+            names, defaults={"created_by_id": created_by_id}
+        )
+
+
+class ScientificArticleLikeRepository(AbstractRepository[ScientificArticleLike]):
+    model = ScientificArticleLike
+
+    def liked_article_ids(self, user_id: int, article_ids: Iterable[int]) -> Set[int]:
+        return set(
+            self.filter(
+                created_by_id=user_id, scientific_article_id__in=article_ids
+            ).values_list("scientific_article_id", flat=True)
+        )
+
+    def like(self, article_id: int, user_id: int) -> bool:
+        return (
+            self.insert_ignoring_conflicts(
+                ("scientific_article", "created_by"),
+                scientific_article_id=article_id,
+                created_by_id=user_id,
+            )
+            is not None
+        )
+
+    def unlike(self, article_id: int, user_id: int) -> bool:
+        return bool(
+            self.delete_returning(
+                scientific_article_id=article_id, created_by_id=user_id
+            )
+        )
+
+
+scientific_article_repo = ScientificArticleRepository()
+author_repo = AuthorRepository()
+scientific_article_like_repo = ScientificArticleLikeRepository()
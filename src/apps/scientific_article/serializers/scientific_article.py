@@ -1,22 +1,30 @@
 from urllib.parse import urlsplit
 
 from django.db import transaction
-from django.utils.text import Truncator
 from rest_framework import serializers
 
-from src.apps.content.models import File, Tag, Image
+from src.apps.content.services.file import file_service
+from src.apps.content.services.image import image_service
+from src.apps.content.services.tag import tag_service
+from src.apps.content.services.upload import upload_service
 from src.apps.scientific_article.models import (
     ScientificArticle,
     ScientificArticleTags,
     ScientificArticleImage,
 )
 from src.apps.scientific_article.models.scientific_article import (
-    Author,
     ScientificArticleAuthors,
     ScientificArticleLike,
     ScientificArticleComments,
 )
-from src.utils.functions import raise_validation_error_detail
+from src.apps.scientific_article.services.scientific_article import (
+    article_likes_counter,
+    author_service,
+    scientific_article_like_service,
+    scientific_article_service,
+)
+from src.utils.bases.serializers import PreparedListSerializer, PreparedSerializerMixin
+from src.utils.images import accepts_webp
 
 
 class UserShortSerializer(serializers.Serializer):
@@ -28,6 +36,7 @@ class UserShortSerializer(serializers.Serializer):
 class ScientificArticleCommentListSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     content = serializers.CharField(required=True)
+    created_at = serializers.DateTimeField(read_only=True)
     created_by = UserShortSerializer()
 
 
@@ -58,13 +67,15 @@ class ScientificArticleCreateSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(
         child=serializers.CharField(max_length=50), required=False, write_only=True
     )
-    file = ScientificArticleFileSerializer(required=True)
+    file = ScientificArticleFileSerializer(required=False, allow_null=True)
+    # a File produced by a finalized chunked upload, instead of `file`
+    file_id = serializers.IntegerField(required=False, allow_null=True, write_only=True)
     images = ScientificArticleImageSerializer(many=True, required=True, write_only=True)
     authors = serializers.CharField(max_length=60, required=True, write_only=True)
 
     class Meta:
         model = ScientificArticle
-        fields = ("title", "content", "authors", "tags", "images", "file")
+        fields = ("title", "content", "authors", "tags", "images", "file", "file_id")
 
     def is_valid(self, *, raise_exception=False):
         return super().is_valid(raise_exception=raise_exception)
@@ -76,69 +87,70 @@ class ScientificArticleCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         tags_data = validated_data.pop("tags", [])
         authors_data = validated_data.pop("authors", [])
-        file_data = validated_data.pop("file")
+        file_data = validated_data.pop("file", None)
+        file_id = validated_data.pop("file_id", None)
         images_data = validated_data.pop("images")
 
-        content_file = File.objects.create(
-            title=file_data["title"],
-            file=file_data["file"],
-        )
+        if file_id is None:
+            file_id = file_service.create(
+                title=file_data["title"],
+                file=file_data["file"],
+            ).id
 
         article = ScientificArticle.objects.create(
-            file=content_file,
+            file_id=file_id,
             **validated_data,
         )
 
         if tags_data:
-            through_rows = []
-            for t in tags_data:
-                t = t.strip()
-                tag_obj, _ = Tag.objects.get_or_create(name=t)
-                through_rows.append(
-                    ScientificArticleTags(
-                        scientific_article=article,
-                        tag=tag_obj,
-                    )
-                )
             ScientificArticleTags.objects.bulk_create(
-                through_rows, ignore_conflicts=True
+                [
+                    ScientificArticleTags(scientific_article=article, tag_id=tag_id)
+                    for tag_id in tag_service.resolve_ids(tags_data)
+                ],
+                ignore_conflicts=True,
             )
         if authors_data:
-            through_rows = []
-            for a in authors_data.strip().split(","):
-                a = a.strip()
-                if not a.strip():
-                    continue
-                author_obj, _ = Author.objects.get_or_create(
-                    name=a, defaults={"created_by_id": self._get_user().id}
-                )
-                obj = ScientificArticleAuthors(
-                    scientific_article=article, author=author_obj
-                )
-                through_rows.append(obj)
-            ScientificArticleAuthors.objects.bulk_create(
-                through_rows, ignore_conflicts=True
+            author_ids = author_service.resolve_ids(
+                authors_data.split(","), created_by_id=self._get_user().id
             )
-
-        img_links = []
-        for im in images_data:
-            uploaded = im["image"]
-            title = (im.get("title") or "").strip()
-            content_img = Image.objects.create(
-                image=uploaded,
+            ScientificArticleAuthors.objects.bulk_create(
+                [
+                    ScientificArticleAuthors(scientific_article=article, author_id=a_id)
+                    for a_id in author_ids
+                ],
+                ignore_conflicts=True,
             )
-            img_links.append(
-                ScientificArticleImage(
-                    scientific_article=article,
-                    image=content_img,
-                    title=title,
-                    created_by=self._get_user(),
-                )
+        scientific_article_service.refresh_search_vector([article.id])
+
+        content_images = image_service.create_many([im["image"] for im in images_data])
+        img_links = [
+            ScientificArticleImage(
+                scientific_article=article,
+                image=content_img,
+                title=(im.get("title") or "").strip(),
+                created_by=self._get_user(),
             )
+            for im, content_img in zip(images_data, content_images)
+        ]
         ScientificArticleImage.objects.bulk_create(img_links)
 
         return article
 
+    def validate_file_id(self, value):
+        if value is not None and not upload_service.is_owned_file(
+            value, self._get_user().id
+        ):
+            raise serializers.ValidationError("Unknown upload.")
+        return value
+
+    def validate(self, attrs):
+        if (attrs.get("file") is None) == (attrs.get("file_id") is None):
+            raise serializers.ValidationError(
+                {"file": "Provide either `file` or `file_id` of a finished upload."}
+            )
+        return attrs
+
     def validate_authors(self, value: str) -> str:
         if not value.strip().split(","):
             raise serializers.ValidationError("At least one author is required")
@@ -170,29 +182,44 @@ class RelativeURLMixin:
         return path or None
 
 
-class ScientificArticleListSerializer(serializers.ModelSerializer, RelativeURLMixin):
+class ScientificArticleListSerializer(
+    PreparedSerializerMixin, serializers.ModelSerializer, RelativeURLMixin
+):
     tags = serializers.SerializerMethodField()
     cover_image = serializers.SerializerMethodField()
     file = serializers.SerializerMethodField()
-    content_preview = serializers.SerializerMethodField()
+    liked_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = ScientificArticle
+        list_serializer_class = PreparedListSerializer
         fields = (
             "id",
             "title",
             "content_preview",
+            "word_count",
+            "reading_time",
             "tags",
             "cover_image",
             "file",
             "comments_count",
             "likes_count",
+            "liked_by_me",
+        )
+
+    def prepare(self, instances):
+        article_likes_counter.merge(instances)
+        user = self.request_user()
+        self._liked_ids = (
+            scientific_article_like_service.liked_article_ids(
+                user.id, [article.id for article in instances]
+            )
+            if user.is_authenticated
+            else set()
         )
 
-    def get_content_preview(self, obj):
-        text = obj.content or ""
-        limit = int(self.context.get("preview_limit", 160))
-        return Truncator(text).chars(limit)
+    def get_liked_by_me(self, obj) -> bool:
+        return obj.id in self._liked_ids
 
     def get_tags(self, obj):
         return [t.name for t in obj.tags.all()]
@@ -205,20 +232,64 @@ class ScientificArticleListSerializer(serializers.ModelSerializer, RelativeURLMi
 
     def get_cover_image(self, obj):
         link = self._first_prefetched_image(obj)
-        file_field = getattr(getattr(link, "image", None), "file", None)
-        return self.to_relative_path(getattr(file_field, "url", None))
+        if link is None:
+            return None
+        webp = accepts_webp(self.context.get("request"))
+        return self.to_relative_path(
+            image_service.variant_url(link.image, "thumb", webp)
+        )
 
     def get_file(self, obj):
         file_field = getattr(getattr(obj, "file", None), "file", None)
         return self.to_relative_path(getattr(file_field, "url", None))
 
 
+class ScientificArticleSearchSerializer(
+    PreparedSerializerMixin, serializers.ModelSerializer
+):
+    """
+    Search hit: a highlighted snippet instead of `content`, which is never
+    loaded from the database for search results.
+    """
+
+    tags = serializers.SerializerMethodField()
+    authors = serializers.SerializerMethodField()
+    snippet = serializers.CharField(read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ScientificArticle
+        list_serializer_class = PreparedListSerializer
+        fields = (
+            "id",
+            "title",
+            "snippet",
+            "authors",
+            "tags",
+            "comments_count",
+            "likes_count",
+            "rank",
+        )
+
+    def prepare(self, instances):
+        article_likes_counter.merge(instances)
+
+    def get_tags(self, obj) -> list[str]:
+        return [t.name for t in obj.tags.all()]
+
+    def get_authors(self, obj) -> list[str]:
+        return [a.name for a in obj.authors.all()]
+
+
 class ScientificArticleDetailSerializer(serializers.ModelSerializer, RelativeURLMixin):
     tags = serializers.SerializerMethodField()
     images = serializers.SerializerMethodField()
     file = serializers.SerializerMethodField()
     authors = serializers.SerializerMethodField()
-    comments = ScientificArticleCommentListSerializer(many=True, required=False)
+    # latest comments only, see ScientificArticleViewSet.comments for the rest
+    comments = ScientificArticleCommentListSerializer(
+        source="latest_comments", many=True, read_only=True
+    )
 
     class Meta:
         model = ScientificArticle
@@ -226,10 +297,13 @@ class ScientificArticleDetailSerializer(serializers.ModelSerializer, RelativeURL
             "id",
             "title",
             "content",
+            "word_count",
+            "reading_time",
             "authors",
             "tags",
             "images",
             "file",
+            "comments_count",
             "comments",
         )
 
@@ -269,22 +343,9 @@ class ScientificArticleLikeCreateSerializer(serializers.ModelSerializer):
     def _get_user(self):
         return self.context["request"].user
 
-    def validate_scientific_article(self, obj: ScientificArticle):
-        if obj.likes.filter(created_by=self._get_user()).exists():
-            raise_validation_error_detail("Already liked.")
-        return obj
-
     def create(self, validated_data):
         scientific_article = validated_data.pop("scientific_article")
-
-        ScientificArticleLike.objects.create(
-            created_by=self.context["request"].user,
-            scientific_article=scientific_article,
-        )
-
-        scientific_article.likes_count += 1
-        scientific_article.save(update_fields=["likes_count"])
-
+        scientific_article_like_service.like(scientific_article.id, self._get_user().id)
         return scientific_article
 
 
@@ -295,6 +356,7 @@ class ScientificArticleCommentCreateSerializer(
         model = ScientificArticleComments
         fields = ("scientific_article", "content")
 
+    @transaction.atomic
     def create(self, validated_data):
         scientific_article = validated_data.pop("scientific_article")
         ScientificArticleComments.objects.create(
@@ -303,7 +365,8 @@ class ScientificArticleCommentCreateSerializer(
             **validated_data,
         )
 
-        scientific_article.comments_count += 1
-        scientific_article.save(update_fields=["comments_count"])
+        scientific_article_service.increment_counters(
+            scientific_article.id, comments_count=1
+        )
 
         return scientific_article
@@ -0,0 +1,130 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from django.db.models import Max, QuerySet
+from redis import RedisError
+
+from src.apps.scientific_article.models import (
+    ScientificArticle,
+    ScientificArticleLike,
+)
+from src.apps.scientific_article.models.scientific_article import Author
+from src.apps.scientific_article.repositories.scientific_article import (
+    AuthorRepository,
+    ScientificArticleLikeRepository,
+    ScientificArticleRepository,
+    author_repo,
+    scientific_article_like_repo,
+    scientific_article_repo,
+)
+from src.utils.bases.services import AbstractService
+from src.utils.conts import SEARCH_FACETS_LIMIT
+from src.utils.counters import BufferedCounter
+
+logger = logging.getLogger(__name__)
+
+
+class ScientificArticleService(AbstractService[ScientificArticle]):
+    def __init__(
+        self, repository: ScientificArticleRepository = scientific_article_repo
+    ):
+        super().__init__(repository)
+
+    def detail(self) -> QuerySet[ScientificArticle]:
+        return self._repository.detail()
+
+    def comments(self, article_id: int) -> QuerySet:
+        return self._repository.comments(article_id)
+
+    def search(
+        self, text: str, tags: Sequence[str] = (), authors: Sequence[str] = ()
+    ) -> QuerySet[ScientificArticle]:
+        return self._repository.search(text, tags=tags, authors=authors)
+
+    def with_facets(
+        self, queryset: QuerySet[ScientificArticle], limit: int = SEARCH_FACETS_LIMIT
+    ) -> QuerySet[ScientificArticle]:
+        return self._repository.with_facets(queryset, limit)
+
+    def page_facets(
+        self,
+        page: Sequence[ScientificArticle],
+        queryset: QuerySet[ScientificArticle],
+        limit: int = SEARCH_FACETS_LIMIT,
+    ) -> Dict[str, List[dict]]:
+        """Facets carried by the page rows (see `with_facets`), else one query."""
+        if page and hasattr(page[0], "facet_rows"):
+            return self._repository.group_facets(page[0].facet_rows, limit)
+        return self._repository.facets(queryset, limit)
+
+    def refresh_search_vector(self, article_ids: Sequence[int]) -> int:
+        return self._repository.refresh_search_vector(article_ids)
+
+    def increment_counters(self, article_id: int, **deltas: int) -> int:
+        return self._repository.increment_counters(article_id, **deltas)
+
+    def reconcile_counters(self, batch_size: int = 10_000) -> int:
+        """
+        Walks the table in id ranges of `batch_size`, one UPDATE per range.
+        Each range is recounted right after a like counter flush and under its
+        flush lock, so buffered deltas are neither missed nor applied on top of
+        the recount; without Redis the walk is aborted.
+        """
+        last_id = self.all().aggregate(last=Max("id"))["last"] or 0
+        fixed = 0
+        for id_from in range(0, last_id + 1, batch_size):
+            try:
+                with article_likes_counter.flushed():
+                    fixed += self._repository.reconcile_counters(
+                        id_from, id_from + batch_size
+                    )
+            except RedisError:
+                logger.warning(
+                    "like counters not flushed, reconciliation aborted at id %s",
+                    id_from,
+                )
+                break
+        return fixed
+
+
+class AuthorService(AbstractService[Author]):
+    def __init__(self, repository: AuthorRepository = author_repo):
+        super().__init__(repository)
+
+    def resolve_ids(
+        self, names: Iterable[str], created_by_id: Optional[int] = None
+    ) -> List[int]:
+        """Author ids for `names`, creating missing authors; ~2 queries per call."""
+        return self._repository.resolve_ids(names, created_by_id)
+
+
+class ScientificArticleLikeService(AbstractService[ScientificArticleLike]):
+    def __init__(
+        self, repository: ScientificArticleLikeRepository = scientific_article_like_repo
+    ):
+        super().__init__(repository)
+
+    def liked_article_ids(self, user_id: int, article_ids: Iterable[int]) -> Set[int]:
+        return self._repository.liked_article_ids(user_id, article_ids)
+
+    def like(self, article_id: int, user_id: int) -> bool:
+        """
+        Idempotent like in one statement; the counter moves only when a row
+        was actually inserted, so a double tap counts once.
+        """
+        liked = self._repository.like(article_id, user_id)
+        if liked:
+            article_likes_counter.incr_on_commit(article_id, 1)
+        return liked
+
+    def unlike(self, article_id: int, user_id: int) -> bool:
+        unliked = self._repository.unlike(article_id, user_id)
+        if unliked:
+            article_likes_counter.incr_on_commit(article_id, -1)
+        return unliked
+
+
+scientific_article_service = ScientificArticleService()
+author_service = AuthorService()
+scientific_article_like_service = ScientificArticleLikeService()
+article_likes_counter = BufferedCounter(ScientificArticle, "likes_count")
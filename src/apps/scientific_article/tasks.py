@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from src.apps.scientific_article.services.scientific_article import (
+    article_likes_counter,
+    scientific_article_service,
+)
+
+
+@shared_task
+def flush_article_like_counters() -> int:
+    return article_likes_counter.flush()
+
+
+@shared_task
+def reconcile_article_counters() -> int:
+    return scientific_article_service.reconcile_counters()
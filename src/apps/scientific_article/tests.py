@@ -0,0 +1,243 @@
+from contextlib import nullcontext
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from src.apps.accounts.models import User
+from src.apps.content.models import File, Tag
+from src.apps.scientific_article.models import ScientificArticle, ScientificArticleTags
+from src.apps.scientific_article.models.scientific_article import (
+    Author,
+    ScientificArticleAuthors,
+    ScientificArticleComments,
+    ScientificArticleLike,
+)
+from src.apps.scientific_article.services.scientific_article import (
+    article_likes_counter,
+    scientific_article_like_service,
+    scientific_article_service,
+)
+from src.apps.scientific_article.tasks import reconcile_article_counters
+
+
+class ScientificArticleSearchTest(TestCase):
+    SEARCH_URL = "/api/scientific-articles/search/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        file = File.objects.create(title="paper", file="files/paper.pdf")
+        physics, biology = Tag.objects.create(name="physics"), Tag.objects.create(
+            name="biology"
+        )
+        curie = Author.objects.create(name="Curie")
+        cls.articles = []
+        for i, tag in enumerate([physics, physics, biology]):
+            article = ScientificArticle.objects.create(
+                title=f"Radiation study {i}", content="decay " * 500, file=file
+            )
+            ScientificArticleTags.objects.create(scientific_article=article, tag=tag)
+            ScientificArticleAuthors.objects.create(
+                scientific_article=article, author=curie
+            )
+            cls.articles.append(article)
+        ScientificArticle.objects.create(title="Unrelated", content="x", file=file)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_results_and_facets(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.SEARCH_URL, {"q": "radiation"})
+        self.assertEqual(response.status_code, 200)
+        # articles, tags, authors, facets
+        self.assertEqual(len(ctx.captured_queries), 4)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertNotIn("content", response.data["results"][0])
+        self.assertEqual(
+            response.data["facets"]["tags"],
+            [{"name": "physics", "count": 2}, {"name": "biology", "count": 1}],
+        )
+        self.assertEqual(
+            response.data["facets"]["authors"], [{"name": "Curie", "count": 3}]
+        )
+
+    def test_drill_down_and_next_page(self):
+        response = self.client.get(
+            self.SEARCH_URL, {"q": "radiation", "tags": "physics", "page_size": 1}
+        )
+        next_page = self.client.get(response.data["next"])
+
+        self.assertNotIn("facets", next_page.data)
+        self.assertEqual(
+            sorted(
+                item["id"]
+                for item in response.data["results"] + next_page.data["results"]
+            ),
+            [article.id for article in self.articles[:2]],
+        )
+
+    def test_query_is_required(self):
+        response = self.client.get(self.SEARCH_URL)
+        self.assertEqual(response.status_code, 400)
+
+
+class ArticleCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        file = File.objects.create(title="paper", file="files/paper.pdf")
+        cls.article = ScientificArticle.objects.create(
+            title="t", content="c", file=file
+        )
+
+    def test_increment_is_clamped_at_zero(self):
+        scientific_article_service.increment_counters(self.article.id, comments_count=1)
+        scientific_article_service.increment_counters(
+            self.article.id, comments_count=-2
+        )
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
+
+    def test_reconcile_task_fixes_drift(self):
+        ScientificArticleLike.objects.create(
+            scientific_article=self.article, created_by=self.user
+        )
+        ScientificArticleComments.objects.create(
+            scientific_article=self.article, content="c", created_by=self.user
+        )
+        ScientificArticle.objects.filter(id=self.article.id).update(likes_count=7)
+
+        with mock.patch.object(
+            article_likes_counter, "flushed", return_value=nullcontext(0)
+        ):
+            self.assertEqual(reconcile_article_counters(), 1)
+
+        self.article.refresh_from_db()
+        self.assertEqual(
+            (self.article.likes_count, self.article.comments_count), (1, 1)
+        )
+
+    def test_reconcile_is_aborted_without_flush(self):
+        ScientificArticle.objects.filter(id=self.article.id).update(likes_count=7)
+
+        self.assertEqual(reconcile_article_counters(), 0)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 7)
+
+    def test_like_and_unlike_are_idempotent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                liked = scientific_article_like_service.like(
+                    self.article.id, self.user.id
+                )
+            again = scientific_article_like_service.like(self.article.id, self.user.id)
+        self.assertEqual((liked, again), (True, False))
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            unliked = scientific_article_like_service.unlike(
+                self.article.id, self.user.id
+            )
+            again = scientific_article_like_service.unlike(
+                self.article.id, self.user.id
+            )
+        self.assertEqual((unliked, again), (True, False))
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+
+
+class ArticleListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@test.com")
+        file = File.objects.create(title="paper", file="files/paper.pdf")
+        cls.article = ScientificArticle.objects.create(
+            title="Long read", content="word " * 450, file=file
+        )
+
+    def test_content_stats_are_stored_on_save(self):
+        self.assertEqual(self.article.word_count, 450)
+        self.assertEqual(self.article.reading_time, 3)
+        self.assertEqual(len(self.article.content_preview), 160)
+
+        self.article.content = "short"
+        self.article.save(update_fields=["content"])
+        self.article.refresh_from_db()
+        self.assertEqual(
+            (self.article.content_preview, self.article.word_count), ("short", 1)
+        )
+
+    def test_list_does_not_load_content(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/scientific-articles/")
+
+        self.assertEqual(response.status_code, 200)
+        articles_sql = next(
+            q["sql"] for q in ctx.captured_queries if "content_preview" in q["sql"]
+        )
+        self.assertNotIn('"content",', articles_sql)
+        item = response.data["results"][0]
+        self.assertEqual(item["content_preview"], self.article.content_preview)
+        self.assertEqual(item["reading_time"], 3)
+
+
+class ArticleCommentsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create(username=f"u{i}", email=f"u{i}@test.com")
+            for i in range(12)
+        ]
+        cls.user = users[0]
+        file = File.objects.create(title="paper", file="files/paper.pdf")
+        cls.article = ScientificArticle.objects.create(
+            title="t", content="c", file=file
+        )
+        ScientificArticleAuthors.objects.create(
+            scientific_article=cls.article,
+            author=Author.objects.create(name="Curie"),
+        )
+        cls.comments = [
+            ScientificArticleComments.objects.create(
+                scientific_article=cls.article, content=str(i), created_by=user
+            )
+            for i, user in enumerate(users)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_detail_embeds_latest_comments_in_fixed_queries(self):
+        # article, tags, images, authors, comments
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/api/scientific-articles/{self.article.id}/")
+
+        comments = response.data["comments"]
+        self.assertEqual(len(comments), 10)
+        self.assertEqual(comments[0]["id"], self.comments[-1].id)
+        self.assertEqual(comments[0]["created_by"]["username"], "u11")
+        self.assertEqual(response.data["authors"], ["Curie"])
+
+    def test_comments_endpoint_is_keyset_paginated(self):
+        url = f"/api/scientific-articles/{self.article.id}/comments/"
+        first = self.client.get(url, {"page_size": 7})
+        second = self.client.get(first.data["next"])
+
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(
+            [c["id"] for c in first.data["results"] + second.data["results"]],
+            [c.id for c in reversed(self.comments)],
+        )
+        self.assertEqual(
+            self.client.get("/api/scientific-articles/0/comments/").status_code, 404
+        )
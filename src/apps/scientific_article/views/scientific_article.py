@@ -1,8 +1,11 @@
 from http import HTTPMethod
 
+from django.db import transaction
 from django.db.models import Prefetch
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import CreateAPIView, DestroyAPIView
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
@@ -16,16 +19,23 @@ from src.apps.scientific_article.models import (
 from src.apps.scientific_article.serializers.scientific_article import (
     ScientificArticleListSerializer,
     ScientificArticleDetailSerializer,
+    ScientificArticleSearchSerializer,
     ScientificArticleCreateSerializer,
     ScientificArticleLikeCreateSerializer,
     ScientificArticleCommentListSerializer,
     ScientificArticleCommentCreateSerializer,
 )
-from src.utils.functions import normalize_strict
+from src.apps.scientific_article.services.scientific_article import (
+    scientific_article_like_service,
+    scientific_article_service,
+)
+from src.utils.functions import normalize_strict, raise_validation_error_detail
+from src.utils.images import VaryOnAcceptMixin
+from src.utils.pagination import KeysetPagination, RankKeysetPagination
 
 
 @extend_schema(tags=["scientific_article"])
-class ScientificArticleViewSet(ModelViewSet):
+class ScientificArticleViewSet(VaryOnAcceptMixin, ModelViewSet):
     http_method_names = [
         HTTPMethod.GET.lower(),
         HTTPMethod.POST.lower(),
@@ -36,8 +46,13 @@ class ScientificArticleViewSet(ModelViewSet):
         image_link_qs = ScientificArticleImage.objects.select_related("image").order_by(
             "id"
         )
+        queryset = ScientificArticle.objects.all()
+        if self.action == "list":
+            queryset = queryset.defer("content", "search_vector")
+        elif self.action == "retrieve":
+            queryset = scientific_article_service.detail().defer("search_vector")
         return (
-            ScientificArticle.objects.select_related("file")
+            queryset.select_related("file")
             .prefetch_related(
                 "tags",
                 Prefetch(
@@ -64,9 +79,83 @@ class ScientificArticleViewSet(ModelViewSet):
         print("Errors:\n", serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, required=True),
+            OpenApiParameter("tags", str, many=True),
+            OpenApiParameter("authors", str, many=True),
+            OpenApiParameter("cursor", str),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    @action(detail=False, methods=[HTTPMethod.GET.lower()], url_path="search")
+    def search(self, request, *args, **kwargs):
+        """
+        Ranked full-text search, keyset paginated on (rank, id). The first
+        page also carries tag/author facet counts over all matches.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise_validation_error_detail({"q": "This query parameter is required."})
+
+        queryset = scientific_article_service.search(
+            text,
+            tags=request.query_params.getlist("tags"),
+            authors=request.query_params.getlist("authors"),
+        )
+        paginator = RankKeysetPagination()
+        first_page = not request.query_params.get(paginator.cursor_query_param)
+        page = paginator.paginate_queryset(
+            (
+                scientific_article_service.with_facets(queryset)
+                if first_page
+                else queryset
+            ),
+            request,
+            view=self,
+        )
+        response = paginator.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+        if first_page:
+            response.data["facets"] = scientific_article_service.page_facets(
+                page, queryset
+            )
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("cursor", str),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    @action(detail=True, methods=[HTTPMethod.GET.lower()], url_path="comments")
+    def comments(self, request, *args, **kwargs):
+        """
+        Comments of an article, newest first, keyset paginated on
+        (created_at, id).
+        """
+        article_id = self.kwargs[self.lookup_field]
+        if not str(article_id).isdigit() or not scientific_article_service.exists(
+            id=article_id
+        ):
+            raise NotFound()
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(
+            scientific_article_service.comments(int(article_id)), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+
     def get_serializer_class(self):
+        if self.action == "comments":
+            return ScientificArticleCommentListSerializer
         if self.action == "list":
             return ScientificArticleListSerializer
+        if self.action == "search":
+            return ScientificArticleSearchSerializer
         if self.action == "retrieve":
             return ScientificArticleDetailSerializer
         if self.action == "create":
@@ -94,10 +183,9 @@ class ScientificArticleLikeAPIView(CreateAPIView):
         return Response(status=status.HTTP_201_CREATED, headers=headers)
 
     def delete(self, request, *args, **kwargs):
-        instance = self.get_object()
-        instance.scientific_article.likes_count -= 1
-        instance.scientific_article.save(update_fields=["likes_count"])
-        instance.delete()
+        scientific_article_like_service.unlike(
+            kwargs[self.lookup_url_kwarg], request.user.id
+        )
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -118,9 +206,11 @@ class ScientificArticleCommentViewSet(DestroyAPIView, CreateAPIView):
         headers = self.get_success_headers(serializer.data)
         return Response(status=status.HTTP_204_NO_CONTENT, headers=headers)
 
+    @transaction.atomic
     def delete(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.scientific_article.comments_count -= 1
-        instance.scientific_article.save(update_fields=["comments_count"])
+        scientific_article_service.increment_counters(
+            instance.scientific_article_id, comments_count=-1
+        )
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # libraries
     "channels",
     "rest_framework",
@@ -119,11 +120,48 @@ DATABASES = {
 #     },
 # }
 
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
-    },
-}
+# ============== CHANNELS ==============
+# Redis layer: groups are shared by every daphne process and celery worker.
+# Several comma separated CHANNEL_REDIS_URLS shard channels and groups across
+# nodes by consistent hashing; each node gets its own connection pool.
+# CHANNEL_LAYER_BACKEND="memory" keeps everything inside a single process.
+CHANNEL_LAYER_BACKEND = os.getenv("CHANNEL_LAYER_BACKEND", "redis")
+CHANNEL_REDIS_URLS = [
+    url.strip() for url in os.getenv("CHANNEL_REDIS_URLS", "").split(",") if url.strip()
+] or [
+    "redis://:{password}@{host}:{port}/2".format(
+        password=os.getenv("REDIS_PASSWORD", ""),
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=os.getenv("REDIS_PORT", "6379"),
+    )
+]
+CHANNEL_REDIS_POOL_SIZE = int(os.getenv("CHANNEL_REDIS_POOL_SIZE", 200))
+
+if CHANNEL_LAYER_BACKEND == "redis":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [
+                    {
+                        "address": url,
+                        "max_connections": CHANNEL_REDIS_POOL_SIZE,
+                        "health_check_interval": 30,
+                    }
+                    for url in CHANNEL_REDIS_URLS
+                ],
+                "capacity": 1500,
+                "expiry": 10,
+                "group_expiry": 86400,
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        },
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -153,6 +191,11 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# "x-accel": Django checks access, nginx sends the file (X-Accel-Redirect);
+# "django": Django streams media itself, DEBUG only
+MEDIA_DELIVERY = os.environ.get("MEDIA_DELIVERY", "django")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+MEDIA_CACHE_MAX_AGE = int(os.environ.get("MEDIA_CACHE_MAX_AGE", 3600))
 
 APP_URL = "apps"
 APP_ROOT = os.path.join(MEDIA_ROOT, APP_URL)
@@ -192,9 +235,41 @@ CELERY_BROKER_URL = f"redis://{os.environ.get("MQ_HOST")}:{os.environ.get("MQ_PO
 CELERY_RESULT_BACKEND = (
     f"redis://{os.environ.get("MQ_HOST")}:{os.environ.get("MQ_PORT")}/0"
 )
+CELERY_BEAT_SCHEDULE = {
+    "flush-post-like-counters": {
+        "task": "src.apps.content.tasks.flush_post_like_counters",
+        "schedule": 5.0,
+    },
+    "flush-article-like-counters": {
+        "task": "src.apps.scientific_article.tasks.flush_article_like_counters",
+        "schedule": 5.0,
+    },
+    "reconcile-article-counters": {
+        "task": "src.apps.scientific_article.tasks.reconcile_article_counters",
+        "schedule": 3600.0,
+    },
+    "relay-outbox": {
+        "task": "src.apps.notifications.tasks.relay_outbox",
+        "schedule": 10.0,
+    },
+    "purge-stale-uploads": {
+        "task": "src.apps.content.tasks.purge_stale_uploads",
+        "schedule": 3600.0,
+    },
+    "recover-chat-messages": {
+        "task": "src.apps.chat.tasks.recover_chat_messages",
+        "schedule": 60.0,
+    },
+}
 
 BOOTSTRAP_KEY = os.getenv("BOOTSTRAP_KEY")
 
+# ============== SEARCH ==============
+POSTGRES_SEARCH_CONFIG = os.environ.get("POSTGRES_SEARCH_CONFIG", "simple")
+
+# ============== TIMELINES ==============
+TIMELINE_MAX_LENGTH = int(os.environ.get("TIMELINE_MAX_LENGTH", 1000))
+
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
@@ -206,3 +281,43 @@ EMAIL_USE_SSL = False
 EMAIL_TIMEOUT = 1
 EMAIL_TOKEN_EXPIRE_MINUTES = 5
 DEFAULT_FROM_EMAIL = "send.message.2333@gmail.com"
+
+# ============== IMAGE VARIANTS ==============
+# name -> bounding box; each is stored in the source format and as WebP
+IMAGE_VARIANTS = {
+    "thumb": (320, 320),
+    "medium": (1080, 1080),
+}
+IMAGE_VARIANT_WEBP_QUALITY = int(os.environ.get("IMAGE_VARIANT_WEBP_QUALITY", 80))
+# threads writing the files of one multi-image upload
+MEDIA_INGEST_WORKERS = int(os.environ.get("MEDIA_INGEST_WORKERS", 8))
+
+# ============== CHUNKED UPLOADS ==============
+CHUNKED_UPLOAD_DIR = os.environ.get(
+    "CHUNKED_UPLOAD_DIR", os.path.join(BASE_DIR, "tmp", "uploads")
+)
+CHUNKED_UPLOAD_CHUNK_SIZE = int(
+    os.environ.get("CHUNKED_UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024)
+)
+CHUNKED_UPLOAD_MAX_SIZE = int(
+    os.environ.get("CHUNKED_UPLOAD_MAX_SIZE", 2 * 1024 * 1024 * 1024)
+)
+CHUNKED_UPLOAD_EXPIRE_HOURS = int(os.environ.get("CHUNKED_UPLOAD_EXPIRE_HOURS", 24))
+
+# ============== OUTBOX ==============
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 500))
+# notifications are also published to RabbitMQ when set
+OUTBOX_RABBITMQ_HOST = os.environ.get("OUTBOX_RABBITMQ_HOST") or None
+
+# ============== CHAT ==============
+# messages are fanned out first and inserted in batches every few ms
+CHAT_WRITE_BEHIND_INTERVAL = (
+    int(os.environ.get("CHAT_WRITE_BEHIND_INTERVAL_MS", 5)) / 1000
+)
+CHAT_WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("CHAT_WRITE_BEHIND_BATCH_SIZE", 500))
+# message ids reserved from the sequence per query
+CHAT_ID_BLOCK_SIZE = int(os.environ.get("CHAT_ID_BLOCK_SIZE", 1000))
+# queued messages are journaled in Redis until stored; entries older than the
+# grace period belong to a dead process and are stored by celery beat
+CHAT_JOURNAL_ENABLED = os.environ.get("CHAT_JOURNAL_ENABLED", "true").lower() == "true"
+CHAT_JOURNAL_GRACE = int(os.environ.get("CHAT_JOURNAL_GRACE_SECONDS", 60))
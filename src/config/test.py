@@ -7,3 +7,11 @@ DATABASES["default"] = {  # noqa
 
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_BROKER_URL = "memory://"
+CELERY_RESULT_BACKEND = "cache+memory://"
+
+# single-node stand-in for the Redis channel layer
+CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+# no Redis in tests: the write-behind queue is not journaled
+CHAT_JOURNAL_ENABLED = False
@@ -1,7 +1,7 @@
-from django.conf.urls.static import static
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.contrib import admin
 from django.conf import settings
+from src.utils.media import serve_media
 from . import swagger
 
 
@@ -12,7 +12,8 @@ urlpatterns = [
     path("api/scientific-articles/", include("src.apps.scientific_article.urls")),
     path("api/chat/", include("src.apps.chat.urls")),
     path("api/notifications/", include("src.apps.notifications.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", serve_media),
+]
 
 
 urlpatterns += swagger.urlpatterns
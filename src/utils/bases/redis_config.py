@@ -1,17 +1,37 @@
 from redis import Redis
-from typing import Union
+from redis.asyncio import Redis as AsyncRedis
+from typing import Optional, Union
 import redis
 import os
 
 
 class RedisConfig:
-    def get_redis(self) -> Union[Redis, bool]:
-        rd = Redis(
-            host=os.environ.get("REDIS_HOST"),
-            port=os.environ.get("REDIS_PORT"),
+    _client: Optional[Redis] = None
+
+    def get_client(self) -> Redis:
+        """Shared client (and connection pool) for the process, without a ping."""
+        if RedisConfig._client is None:
+            RedisConfig._client = Redis(**self._connection_kwargs())
+        return RedisConfig._client
+
+    def get_async_client(self) -> AsyncRedis:
+        """New asyncio client; its pool belongs to the loop that first uses it."""
+        return AsyncRedis(**self._connection_kwargs())
+
+    @staticmethod
+    def _connection_kwargs() -> dict:
+        return dict(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+            password=os.environ.get("REDIS_PASSWORD") or None,
             decode_responses=True,
             health_check_interval=30,
+            socket_connect_timeout=1,
+            socket_timeout=1,
         )
+
+    def get_redis(self) -> Union[Redis, bool]:
+        rd = self.get_client()
         if not self.check_health(redis_conn=rd):
             return False
         return rd
@@ -22,3 +42,6 @@ class RedisConfig:
             return True
         except redis.ConnectionError:
             return False
+
+
+redis_config = RedisConfig()
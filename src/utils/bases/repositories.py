@@ -11,7 +11,7 @@ from typing import (
     Union,
     List,
 )
-from django.db import models
+from django.db import connection, models
 from src.utils.functions import raise_validation_error
 from src.utils.bases.types import TModel
 
@@ -88,6 +88,53 @@ class AbstractEditRepository(Generic[TModel]):
         instance, created = self.model.objects.update_or_create(**kwargs)
         return instance, created
 
+    def insert_ignoring_conflicts(
+        self, conflict_fields: Sequence[str], **values
+    ) -> Optional[int]:
+        """
+        Single `INSERT ... ON CONFLICT (conflict_fields) DO NOTHING RETURNING pk`.
+        Returns the new pk, or None when a conflicting row already exists.
+        Field defaults and `auto_now_add` are applied as `create()` would.
+        """
+        opts = self.model._meta
+        fields = [f for f in opts.concrete_fields if not f.primary_key]
+        obj = self.model(**values)
+        params = [
+            f.get_db_prep_save(f.pre_save(obj, add=True), connection) for f in fields
+        ]
+        qn = connection.ops.quote_name
+        sql = (
+            f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(f.column) for f in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT ({', '.join(qn(opts.get_field(n).column) for n in conflict_fields)}) "
+            f"DO NOTHING RETURNING {qn(opts.pk.column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def delete_returning(self, **values) -> List[int]:
+        """
+        Single `DELETE ... WHERE field = value AND ... RETURNING pk`, bypassing
+        the collector; only for models nothing else references.
+        """
+        opts = self.model._meta
+        qn = connection.ops.quote_name
+        fields = [opts.get_field(name) for name in values]
+        where = " AND ".join(f"{qn(f.column)} = %s" for f in fields)
+        params = [
+            f.get_db_prep_value(value, connection)
+            for f, value in zip(fields, values.values())
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {qn(opts.db_table)} WHERE {where} "
+                f"RETURNING {qn(opts.pk.column)}",
+                params,
+            )
+            return [row[0] for row in cursor.fetchall()]
+
 
 class AbstractRepository(
     Generic[TModel],
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import AnonymousUser
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+
+class PreparedListSerializer(serializers.ListSerializer):
+    """
+    Calls `child.prepare(instances)` once for the whole page before rendering,
+    so per-item extras are loaded with one query / Redis call per page.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        instances = list(iterable)
+        self.child.prepare(instances)
+        return super().to_representation(instances)
+
+
+class PreparedSerializerMixin:
+    """
+    Use together with `Meta.list_serializer_class = PreparedListSerializer`.
+    A single object (retrieve) is prepared on its own.
+    """
+
+    def prepare(self, instances) -> None:
+        pass
+
+    def request_user(self):
+        """The requesting user; anonymous when serializing without a request."""
+        request = self.context.get("request")
+        return getattr(request, "user", None) or AnonymousUser()
+
+    def to_representation(self, instance):
+        if not isinstance(self.parent, PreparedListSerializer):
+            self.prepare([instance])
+        return super().to_representation(instance)
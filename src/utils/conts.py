@@ -19,3 +19,20 @@ PREFIX_API_VERSION = f"{API_CONST}/{API_VERSION}"
 
 class NotifcationType(IntEnum):
     POST_LIKED = 1
+    POST_COMMENTED = 2
+
+
+class OutboxTopic(StrEnum):
+    POST_LIKED = "post_liked"
+    POST_COMMENTED = "post_commented"
+
+
+FEED_COMMENTS_LIMIT = 3
+ARTICLE_COMMENTS_LIMIT = 10
+CHAT_HISTORY_PAGE_SIZE = 50
+CHAT_HISTORY_MAX_PAGE_SIZE = 100
+LAST_MESSAGE_PREVIEW_LENGTH = 120
+SEARCH_FACETS_LIMIT = 20
+SEARCH_SNIPPET_LENGTH = 240
+CONTENT_PREVIEW_LENGTH = 160
+READING_WORDS_PER_MINUTE = 200
@@ -0,0 +1,162 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from itertools import count, islice
+from typing import Dict, Iterable, Iterator, Sequence, Type
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Model
+from django.db.models.functions import Greatest
+from redis import RedisError
+
+from src.apps.content.models.counter import CounterFlush
+from src.utils.bases.redis_config import RedisConfig, redis_config
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    """
+    Counter column buffered in a Redis hash: likes/unlikes are a HINCRBY on
+    `counters:<table>:<field>` instead of a row lock on the hot row. `flush()`
+    (celery beat) applies the pending deltas to the table in bulk; reads add
+    the pending delta to the persisted value.
+
+    When Redis is unavailable the delta is written straight to the table with
+    an atomic `F()` update, so no increments are lost.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        field: str,
+        config: RedisConfig = redis_config,
+        batch_size: int = 1000,
+    ):
+        self.model = model
+        self.field = field
+        # Fixed per counter: a retried hash must be cut into the same batches.
+        self.batch_size = batch_size
+        self.key = f"counters:{model._meta.db_table}:{field}"
+        self._config = config
+
+    def incr(self, obj_id: int, delta: int = 1) -> None:
+        try:
+            self._config.get_client().hincrby(self.key, obj_id, delta)
+        except RedisError:
+            logger.warning("%s unavailable, writing delta to the DB", self.key)
+            self._apply({obj_id: delta})
+
+    def incr_on_commit(self, obj_id: int, delta: int = 1) -> None:
+        transaction.on_commit(lambda: self.incr(obj_id, delta))
+
+    def pending(self, ids: Sequence[int]) -> Dict[int, int]:
+        if not ids:
+            return {}
+        try:
+            values = self._config.get_client().hmget(self.key, list(ids))
+        except RedisError:
+            return {}
+        return {obj_id: int(v) for obj_id, v in zip(ids, values) if v}
+
+    def merge(self, instances: Iterable[Model]) -> None:
+        """Adds the not yet flushed delta to the persisted value of each instance."""
+        instances = list(instances)
+        pending = self.pending([instance.pk for instance in instances])
+        for instance in instances:
+            if instance.pk in pending:
+                value = getattr(instance, self.field) + pending[instance.pk]
+                setattr(instance, self.field, max(value, 0))
+
+    def flush(self) -> int:
+        """
+        Moves the hash aside with RENAME (new increments start a fresh hash) and
+        applies it in batches. A hash left over by a crashed flush is retried
+        first; every batch is recorded in `CounterFlush` in the transaction
+        that applies it, so a retried batch is skipped instead of applied twice.
+        """
+        client = self._config.get_client()
+        lock = client.lock(self.lock_key, timeout=300, blocking=False)
+        if not lock.acquire():
+            return 0
+        try:
+            return self._flush(client)
+        finally:
+            lock.release()
+
+    @contextmanager
+    def flushed(self) -> Iterator[int]:
+        """
+        Flushes and keeps holding the flush lock for the body, so a recount run
+        inside it neither misses pending deltas nor has them applied on top of
+        it later. Raises RedisError (LockError included) when that is not
+        possible.
+        """
+        client = self._config.get_client()
+        with client.lock(self.lock_key, timeout=300, blocking_timeout=30):
+            yield self._flush(client)
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:flush-lock"
+
+    def _flush(self, client) -> int:
+        flushing = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            client.rename(self.key, flushing)
+        except RedisError as e:
+            if "no such key" not in str(e).lower():
+                raise
+
+        flushed = 0
+        for key in client.scan_iter(match=f"{self.key}:flushing:*"):
+            # Sorted, so a retry cuts the same batches as the first attempt.
+            deltas = sorted(
+                (int(obj_id), int(delta))
+                for obj_id, delta in client.hgetall(key).items()
+                if int(delta)
+            )
+            items = iter(deltas)
+            for number in count():
+                batch = dict(islice(items, self.batch_size))
+                if not batch:
+                    break
+                self._apply_once(f"{key}:{number}", batch)
+            client.delete(key)
+            CounterFlush.objects.filter(key__startswith=f"{key}:").delete()
+            flushed += len(deltas)
+        return flushed
+
+    def _apply_once(self, batch_key: str, deltas: Dict[int, int]) -> bool:
+        try:
+            with transaction.atomic():
+                CounterFlush.objects.create(key=batch_key)
+                self._apply(deltas)
+        except IntegrityError:
+            return False
+        return True
+
+    def _apply(self, deltas: Dict[int, int]) -> None:
+        if connection.vendor != "postgresql":
+            with transaction.atomic():
+                for obj_id, delta in deltas.items():
+                    self.model.objects.filter(pk=obj_id).update(
+                        **{self.field: Greatest(F(self.field) + delta, 0)}
+                    )
+            return
+
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        column = connection.ops.quote_name(
+            self.model._meta.get_field(self.field).column
+        )
+        pk = connection.ops.quote_name(self.model._meta.pk.column)
+        values = ", ".join(["(%s, %s)"] * len(deltas))
+        params = [value for item in deltas.items() for value in item]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS t "
+                f"SET {column} = GREATEST(t.{column} + v.delta, 0) "
+                f"FROM (VALUES {values}) AS v(id, delta) "
+                f"WHERE t.{pk} = v.id",
+                params,
+            )
@@ -223,7 +223,7 @@ def _parse_indexed_objects(
 def normalize_strict(request: HttpRequest) -> Dict[str, Any]:
     """
     Строго под ScientificArticleCreateSerializer:
-      fields = ("title", "content", "authors", "tags", "images", "file")
+      fields = ("title", "content", "authors", "tags", "images", "file", "file_id")
     """
     data = request.data
 
@@ -233,6 +233,7 @@ def normalize_strict(request: HttpRequest) -> Dict[str, Any]:
 
     tags = _parse_tags(data)
     file_ = _parse_file(data)
+    file_id = _get_first(data, "file_id")
     images = _parse_indexed_objects(data, prefix="images", fields=["title", "image"])
 
     return {
@@ -241,5 +242,6 @@ def normalize_strict(request: HttpRequest) -> Dict[str, Any]:
         "authors": authors,
         "tags": tags,
         "file": file_,
+        "file_id": file_id,
         "images": images,
     }
@@ -0,0 +1,77 @@
+from io import BytesIO
+from typing import IO, Iterator, Mapping, NamedTuple, Tuple
+
+from django.utils.cache import patch_vary_headers
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+WEBP_SUFFIX = "_webp"
+
+
+class Derivative(NamedTuple):
+    name: str
+    extension: str
+    content: bytes
+    width: int
+    height: int
+
+
+def render_derivatives(
+    source: IO[bytes],
+    sizes: Mapping[str, Tuple[int, int]],
+    webp_quality: int = 80,
+) -> Iterator[Derivative]:
+    """
+    Downscales `source` into every bounding box of `sizes` (never upscaling),
+    once in the source format family (JPEG, or PNG when there is alpha) and
+    once as WebP (`<name>_webp`).
+    """
+    with PILImage.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    for name, box in sizes.items():
+        resized = image.copy()
+        resized.thumbnail(box, PILImage.Resampling.LANCZOS)
+
+        if has_alpha:
+            yield Derivative(
+                name, "png", _encode(resized, "PNG", optimize=True), *resized.size
+            )
+        else:
+            yield Derivative(
+                name,
+                "jpg",
+                _encode(resized, "JPEG", quality=85, optimize=True, progressive=True),
+                *resized.size,
+            )
+        yield Derivative(
+            name + WEBP_SUFFIX,
+            "webp",
+            _encode(resized, "WEBP", quality=webp_quality, method=4),
+            *resized.size,
+        )
+
+
+def _encode(image: PILImage.Image, fmt: str, **options) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def accepts_webp(request) -> bool:
+    return request is not None and "image/webp" in request.META.get("HTTP_ACCEPT", "")
+
+
+class VaryOnAcceptMixin:
+    """For views whose payload picks image URLs with `accepts_webp`."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,65 @@
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.static import serve
+
+from src.utils.storages import ContentAddressedStorage, is_content_addressed
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def media_access_allowed(request, path: str) -> bool:
+    """Media is public except temp/hidden entries (e.g. `.incoming/`)."""
+    return not any(part.startswith(".") for part in path.split("/"))
+
+
+def serve_media(request, path: str):
+    """
+    Django only decides whether and how a media file may be served. With
+    MEDIA_DELIVERY = "x-accel" nginx streams the bytes from an internal
+    location; "django" streams them itself and is meant for development.
+
+    Content-addressed files get an immutable Cache-Control and their digest
+    as ETag; other files a short max-age and a size/mtime ETag.
+    """
+    if settings.MEDIA_DELIVERY != "x-accel" and not settings.DEBUG:
+        raise Http404
+    if not media_access_allowed(request, path):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+
+    if is_content_addressed(path):
+        etag = f'"{ContentAddressedStorage.digest_of(path)}"'
+        max_age, immutable = IMMUTABLE_MAX_AGE, True
+    else:
+        try:
+            stat = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise Http404
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        max_age, immutable = settings.MEDIA_CACHE_MAX_AGE, False
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_DELIVERY == "x-accel":
+        response = HttpResponse()
+        # nginx picks the type from the file extension
+        del response["Content-Type"]
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    if immutable:
+        patch_cache_control(response, immutable=True)
+    return response
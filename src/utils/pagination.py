@@ -0,0 +1,144 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique composite ordering, e.g. (created_at, id).
+
+    Every page is an index range scan starting right after the last row of the
+    previous page, so page N costs the same as page 1 and rows inserted at the
+    head of the list do not shift the pages a client is scrolling through.
+    No COUNT(*) is issued.
+    """
+
+    ordering: Sequence[str] = ("-created_at", "-id")
+    page_size: int = api_settings.PAGE_SIZE
+    max_page_size: int = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    mode = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request: Request) -> bool:
+        return (
+            cls.cursor_query_param in request.query_params
+            or request.query_params.get(cls.mode_query_param) == cls.mode
+        )
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> List[Any]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.position = self.decode_cursor(request, queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self.get_position_filter(self.position))
+
+        return self.paginate_objects(list(queryset[: self.page_size + 1]))
+
+    def paginate_objects(self, objects: List[Any]) -> List[Any]:
+        """
+        Expects up to page_size + 1 objects already ordered by `ordering`.
+        """
+        self.has_next = len(objects) > self.page_size
+        self.page = objects[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_position_filter(self, position: Sequence[Any]) -> Q:
+        """
+        (a, b) < (x, y)  ==>  a <= x AND (a < x OR (a = x AND b < y))
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & condition
+
+    def get_position(self, instance: Any) -> List[Any]:
+        return [getattr(instance, field.lstrip("-")) for field in self.ordering]
+
+    def encode_cursor(self, position: Sequence[Any]) -> str:
+        values = [v.isoformat() if isinstance(v, datetime) else v for v in position]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(
+        self, request: Request, queryset: QuerySet
+    ) -> Optional[List[Any]]:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self._to_python(queryset, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _to_python(queryset: QuerySet, name: str, value: Any) -> Any:
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class RankKeysetPagination(KeysetPagination):
+    """Keyset pagination for ranked search results annotated with `rank`."""
+
+    ordering = ("-rank", "-id")
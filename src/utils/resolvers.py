@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Type
+
+from django.db import connection, transaction
+from django.db.models import Model
+
+
+class BulkNameResolver:
+    """
+    Resolves unique names (tags, authors, ...) to primary keys in bulk:
+    one `SELECT ... WHERE name IN (...)` for the names missing from an
+    in-process LRU cache and one `INSERT ... ON CONFLICT DO NOTHING RETURNING`
+    for the names that do not exist yet. Names inserted concurrently by
+    another transaction (nothing returned) are picked up by one more SELECT.
+
+    Ids enter the cache only after the transaction that saw them commits, so
+    a rolled back insert never leaves a dangling id behind. Rows are never
+    deleted through the resolver; call `forget()` if that happens elsewhere.
+    """
+
+    def __init__(self, model: Type[Model], field: str = "name", size: int = 4096):
+        self.model = model
+        self.field = field
+        self.size = size
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(
+        self, names: Iterable[str], defaults: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Maps each stripped, non-empty name to its id, creating missing rows
+        with `defaults`. Keys keep the first-seen order of `names`.
+        """
+        names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+        resolved = self._cached(names)
+        missing = [name for name in names if name not in resolved]
+        if missing:
+            found = self._select(missing)
+            absent = [name for name in missing if name not in found]
+            if absent:
+                found.update(self._insert(absent, defaults or {}))
+                absent = [name for name in absent if name not in found]
+            if absent:
+                found.update(self._select(absent))
+            resolved.update(found)
+            transaction.on_commit(lambda: self._remember(found))
+        return {name: resolved[name] for name in names}
+
+    def resolve_ids(
+        self, names: Iterable[str], defaults: Optional[Mapping[str, Any]] = None
+    ) -> List[int]:
+        return list(self.resolve(names, defaults).values())
+
+    def forget(self, names: Iterable[str] = ()) -> None:
+        with self._lock:
+            if not names:
+                self._cache.clear()
+            for name in names:
+                self._cache.pop(name, None)
+
+    def _cached(self, names: List[str]) -> Dict[str, int]:
+        with self._lock:
+            hits = {}
+            for name in names:
+                if name in self._cache:
+                    self._cache.move_to_end(name)
+                    hits[name] = self._cache[name]
+            return hits
+
+    def _remember(self, ids: Mapping[str, int]) -> None:
+        with self._lock:
+            self._cache.update(ids)
+            for name in ids:
+                self._cache.move_to_end(name)
+            while len(self._cache) > self.size:
+                self._cache.popitem(last=False)
+
+    def _select(self, names: List[str]) -> Dict[str, int]:
+        return dict(
+            self.model.objects.filter(**{f"{self.field}__in": names}).values_list(
+                self.field, "pk"
+            )
+        )
+
+    def _insert(self, names: List[str], defaults: Mapping[str, Any]) -> Dict[str, int]:
+        """
+        Builds the INSERT from the model fields so `auto_now_add` and field
+        defaults are applied exactly as `bulk_create` would apply them.
+        """
+        opts = self.model._meta
+        fields = [f for f in opts.concrete_fields if not f.primary_key]
+        objs = [self.model(**{self.field: name}, **defaults) for name in names]
+        params = [
+            f.get_db_prep_save(f.pre_save(obj, add=True), connection)
+            for obj in objs
+            for f in fields
+        ]
+        qn = connection.ops.quote_name
+        row = "(%s)" % ", ".join(["%s"] * len(fields))
+        sql = (
+            f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(f.column) for f in fields)}) "
+            f"VALUES {', '.join([row] * len(objs))} "
+            f"ON CONFLICT ({qn(opts.get_field(self.field).column)}) DO NOTHING "
+            f"RETURNING {qn(opts.get_field(self.field).column)}, {qn(opts.pk.column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return dict(cursor.fetchall())
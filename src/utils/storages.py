@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import tempfile
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django.core.files.storage import FileSystemStorage
+
+DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every upload under the hash of its content:
+    `<upload_to>/ab/cd/abcdef....<ext>`.
+
+    The digest is computed while the upload is streamed to a temporary file
+    next to MEDIA_ROOT, which is then atomically moved into place. A second
+    upload of the same bytes resolves to the name stored first, whatever its
+    extension, and is discarded, so equal content is stored once. The
+    two-level prefix keeps directories small (65536 shards).
+    """
+
+    algorithm = "sha256"
+    shard_levels = 2
+    shard_width = 2
+    incoming_dir = ".incoming"
+
+    def get_available_name(self, name, max_length=None):
+        # the final name is derived from the content in _save
+        return name
+
+    def _save(self, name, content):
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+
+        incoming = self.path(self.incoming_dir)
+        os.makedirs(incoming, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            hasher = hashlib.new(self.algorithm)
+            with os.fdopen(fd, "wb") as tmp:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+
+            name = self.digest_name(directory, hasher.hexdigest(), extension)
+            existing = self._stored_name(name)
+            if existing is not None:
+                os.remove(tmp_path)
+                return existing
+
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            os.replace(tmp_path, full_path)
+            return name
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _stored_name(self, name: str) -> Optional[str]:
+        """`name` or the same digest stored under another extension, if any."""
+        directory, basename = os.path.split(name)
+        digest = self.digest_of(basename)
+        try:
+            entries = os.listdir(self.path(directory))
+        except FileNotFoundError:
+            return None
+        for entry in sorted(entries, key=lambda entry: entry != basename):
+            if self.digest_of(entry) == digest:
+                return f"{directory}/{entry}"
+        return None
+
+    def digest_name(self, directory: str, digest: str, extension: str = "") -> str:
+        shards = [
+            digest[i * self.shard_width : (i + 1) * self.shard_width]
+            for i in range(self.shard_levels)
+        ]
+        return "/".join([p for p in (directory, *shards) if p] + [digest + extension])
+
+    @staticmethod
+    def digest_of(name: str) -> str:
+        return os.path.splitext(os.path.basename(name))[0]
+
+
+@lru_cache(maxsize=None)
+def content_addressed_storage() -> ContentAddressedStorage:
+    """Callable for `FileField(storage=...)`, so migrations do not embed paths."""
+    return ContentAddressedStorage()
+
+
+def save_content_addressed(field, content) -> Tuple[str, str]:
+    """
+    Saves `content` through the content-addressed storage of a model file
+    field without creating a row; returns the stored name and its digest.
+    """
+    name = field.generate_filename(None, os.path.basename(content.name))
+    name = field.storage.save(name, content, max_length=field.max_length)
+    return name, field.storage.digest_of(name)
+
+
+def is_content_addressed(name: str) -> bool:
+    """Content-addressed names never change content, so they cache forever."""
+    return bool(DIGEST_RE.fullmatch(ContentAddressedStorage.digest_of(name)))
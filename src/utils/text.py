@@ -0,0 +1,29 @@
+import math
+import re
+from typing import NamedTuple
+
+from django.utils.text import Truncator
+
+from src.utils.conts import CONTENT_PREVIEW_LENGTH, READING_WORDS_PER_MINUTE
+
+WORD_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+
+
+class ContentStats(NamedTuple):
+    preview: str
+    word_count: int
+    reading_time: int  # minutes, rounded up
+
+
+def content_stats(
+    text: str,
+    preview_length: int = CONTENT_PREVIEW_LENGTH,
+    words_per_minute: int = READING_WORDS_PER_MINUTE,
+) -> ContentStats:
+    text = text or ""
+    word_count = sum(1 for _ in WORD_RE.finditer(text))
+    return ContentStats(
+        preview=Truncator(text).chars(preview_length),
+        word_count=word_count,
+        reading_time=math.ceil(word_count / words_per_minute),
+    )